@@ -6,9 +6,880 @@ import yaml
 import dicttoxml
 import xmltodict
 import xml.dom.minidom as minidom
+import re
+from bisect import bisect_left
+# Imports for follow (tail) mode
+import codecs
+import os
+# Import for conversion resource limits
+import time
+# Imports for record array (JSON Lines / CSV / TSV) conversion
+import csv
+import io
+import itertools
+# Import for compact loading mode
+from collections.abc import Sequence
 # Import for drag and drop support
 from tkinterdnd2 import DND_FILES, TkinterDnD
 
+# CSV/TSVの列推定に使う先頭レコード数
+CSV_SAMPLE_SIZE = 1000
+# 省メモリモードで共有する文字列値の最大長
+INTERN_MAX_LENGTH = 64
+# これより長い行は表示上だけこの長さごとに分割する
+LONG_LINE_LENGTH = 5000
+# 表示上の分割に使う改行に付けるタグ
+SOFT_BREAK_TAG = "softbreak"
+
+# 文字コードの判定に使う先頭のバイト数
+ENCODING_PROBE_SIZE = 64 * 1024
+# UTF-8として読めない場合に使う文字コード
+FALLBACK_ENCODING = "cp932"
+# BOMのないUTF-16と判定するには、片側のNULバイトが2個以上かつ文字数のこの分の1以上必要
+WIDE_NUL_RATIO = 8
+# Tkの元に戻す履歴を消すときに残しておく内容の数
+UNDO_SNAPSHOT_LIMIT = 10
+# 変換時の制限の既定値
+DEFAULT_CONVERSION_LIMITS = {
+    "max_alias_expansions": 100000,  # YAMLのエイリアスで展開されるノード数
+    "max_depth": 200,  # ネストの深さ
+    "max_output_size": 64 * 1024 * 1024,  # 出力の文字数
+    "timeout": 30,  # 処理時間（秒）
+}
+# 変換中に処理時間を確認する間隔（処理した要素数）
+TIME_CHECK_INTERVAL = 1000
+# XMLを読み込むときに処理時間を確認する間隔（文字数）
+XML_CHUNK_SIZE = 64 * 1024
+# 追跡モードでファイルの更新を確認する間隔（ミリ秒）
+FOLLOW_INTERVAL_MS = 1000
+# 追跡モードで1回の確認あたりに読み込む最大バイト数
+FOLLOW_READ_LIMIT = 4 * 1024 * 1024
+# 追跡モードでファイルの置き換えを見分けるために比較する先頭のバイト数
+FOLLOW_HEAD_SIZE = 64
+# 追跡モードで保持する行数分の末尾を探すときに一度に読み込むバイト数
+FOLLOW_TAIL_BLOCK_SIZE = 64 * 1024
+
+_LONG_LINE = re.compile(r"(?m)^[^\n]{%d,}" % (LONG_LINE_LENGTH + 1))
+
+# UTF-32はUTF-16のBOMと先頭が重なるため先に判定する
+_BOMS = [
+    (codecs.BOM_UTF32_LE, "utf-32-le"),
+    (codecs.BOM_UTF32_BE, "utf-32-be"),
+    (codecs.BOM_UTF8, "utf-8"),
+    (codecs.BOM_UTF16_LE, "utf-16-le"),
+    (codecs.BOM_UTF16_BE, "utf-16-be"),
+]
+_XML_ENCODING = re.compile(rb"""^\s*<\?xml[^>]*?encoding\s*=\s*["']([A-Za-z][\w.:-]*)["']""")
+_CODING_COMMENT = re.compile(rb"^[ \t]*#.*?coding[:=][ \t]*([-\w.]+)")
+# Windowsで一般的なShift_JISの拡張を含めて読み書きする
+_ENCODING_ALIASES = {"shift_jis": "cp932", "shift-jis": "cp932", "sjis": "cp932",
+                     "x-sjis": "cp932", "windows-31j": "cp932"}
+
+
+def flatten_record(record, nested="flatten", sep="."):
+    """ネストしたフィールドを1階層のdictに展開する
+
+    nested="flatten" の場合はdictを区切り文字付きのキーに展開し、
+    リストはJSON文字列として格納する。nested="json" の場合は
+    dict・リストともにJSON文字列として格納する。
+    展開したキーが別のキーと重なる場合（"a.b" と {"a": {"b": ...}} など）は、
+    どちらの値も失わないようにそのdictを展開せずにJSON文字列として格納する。
+    """
+    if not isinstance(record, dict):
+        raise ValueError("レコードはオブジェクトである必要があります")
+    if nested != "flatten":
+        return {str(key): value for key, value in record.items()}
+    return _flatten_dict(record, sep)
+
+
+def _flatten_dict(record, sep):
+    """flatten_record の本体（キーの重なりを避けながら1階層分ずつ展開する）"""
+    entries = []
+    for key, value in record.items():
+        sub = _flatten_dict(value, sep) if isinstance(value, dict) and value else None
+        entries.append((str(key), value, sub))
+    while True:
+        names = {}
+        for key, _, sub in entries:
+            for name in ([key] if sub is None else [key + sep + name for name in sub]):
+                names[name] = names.get(name, 0) + 1
+        # 重なりの原因になった展開を取り消し、重なりがなくなるまで繰り返す
+        collided = [index for index, (key, _, sub) in enumerate(entries)
+                    if sub is not None and any(names[key + sep + name] > 1 for name in sub)]
+        if not collided:
+            break
+        for index in collided:
+            key, value, _ = entries[index]
+            entries[index] = (key, value, None)
+    flat = {}
+    for key, value, sub in entries:
+        if sub is None:
+            flat[key] = value
+        else:
+            for name, item in sub.items():
+                flat[key + sep + name] = item
+    return flat
+
+
+def unflatten_record(record, nested="flatten", sep="."):
+    """flatten_recordで展開したdictを元のネスト構造に戻す
+
+    途中までのキー（a.b に対する a など）が別の列として存在する場合は、
+    どちらの値も失わないように区切り文字付きのキーを展開せずに残す。
+    """
+    keys = set(record)
+    result = {}
+    for key, value in record.items():
+        if nested == "flatten" and sep in key:
+            parts = key.split(sep)
+            if any(sep.join(parts[:i]) in keys for i in range(1, len(parts))):
+                result[key] = value
+                continue
+            target = result
+            for part in parts[:-1]:
+                child = target.get(part)
+                if child is None:
+                    child = target[part] = {}
+                elif not isinstance(child, dict):
+                    # 既存のスカラー値と衝突する場合は展開せずにそのまま残す
+                    target = None
+                    break
+                target = child
+            if target is not None and parts[-1] not in target:
+                target[parts[-1]] = value
+                continue
+        result[key] = value
+    return result
+
+
+def _to_cell(value):
+    """レコードの値をCSVのセル文字列に変換する"""
+    if value is None:
+        return ""
+    if isinstance(value, str):
+        return value
+    # bool・数値・ネストした値はJSON表記で格納する
+    # （CSV/TSVからの変換で型を復元するのは「値の型を復元」がオンの場合のみ）
+    return json.dumps(value, ensure_ascii=False, separators=(",", ":"), default=_expand_table)
+
+
+def _from_cell(cell, typed=False):
+    """CSVのセル文字列を値に戻す
+
+    JSON文字列として格納されたオブジェクト・配列は常に復元する。
+    typed=True の場合は数値・true・false も復元し、空のセルはnullにする。
+    NaN・Infinity はJSONとして出力できないため、文字列のまま残す。
+    """
+    if cell is None:
+        return None
+    if typed:
+        if cell == "":
+            return None
+        if cell in ("true", "false", "null") or cell[:1] in "-0123456789":
+            try:
+                return json.loads(cell, parse_constant=_reject_constant)
+            except ValueError:
+                pass
+    if cell[:1] in ("{", "["):
+        try:
+            return json.loads(cell, parse_constant=_reject_constant)
+        except ValueError:
+            pass
+    return cell
+
+
+def _reject_constant(name):
+    """json.loads の parse_constant として NaN・Infinity・-Infinity を拒否する"""
+    raise ValueError(f"{name} はJSONの値として扱えません")
+
+
+def infer_columns(sample):
+    """サンプルレコードから出現順を保った列一覧を推定する"""
+    columns = {}
+    for record in sample:
+        for key in record:
+            columns.setdefault(key, None)
+    return list(columns)
+
+
+def iter_json_records(text, loads=json.loads):
+    """JSON配列またはJSON Linesのテキストからレコードを1件ずつ返す"""
+    try:
+        data = loads(text)
+    except json.JSONDecodeError as e:
+        # 先頭の値の後ろに続きがある場合はJSON Linesとして扱う
+        if e.msg != "Extra data":
+            raise
+    else:
+        if isinstance(data, (list, RecordTable)):
+            yield from data
+        else:
+            yield data
+        return
+
+    for lineno, line in enumerate(io.StringIO(text), 1):
+        if not line.strip():
+            continue
+        try:
+            yield loads(line)
+        except json.JSONDecodeError as e:
+            raise ValueError(f"{lineno}行目のJSONの解析に失敗しました: {e}") from e
+
+
+def iter_delimited_records(text, delimiter=",", nested="flatten", sep=".", typed=False):
+    """CSV/TSVのテキストからレコードを1件ずつ返す"""
+    reader = csv.DictReader(io.StringIO(text, newline=""), delimiter=delimiter)
+    for row in reader:
+        # ヘッダーより列の多い行の余剰分は捨てる
+        row.pop(None, None)
+        yield unflatten_record({key: _from_cell(cell, typed) for key, cell in row.items()}, nested, sep)
+
+
+def _declared_encoding(prefix):
+    """XML宣言や coding: コメントで指定された文字コードを返す（なければNone）"""
+    match = _XML_ENCODING.match(prefix)
+    if match is None:
+        for line in prefix.split(b"\n", 2)[:2]:
+            match = _CODING_COMMENT.match(line)
+            if match is not None:
+                break
+    if match is None:
+        return None
+    name = match.group(1).decode("ascii").lower()
+    name = _ENCODING_ALIASES.get(name, name)
+    try:
+        name = codecs.lookup(name).name
+    except LookupError:
+        return None
+    # 先頭がASCII互換で読めている時点でUTF-16/32の宣言は誤り
+    if name.startswith(("utf-16", "utf-32")):
+        return None
+    return _ENCODING_ALIASES.get(name, name)
+
+
+def _detect_wide_encoding(prefix):
+    """BOMのないUTF-16/32を、先頭のバイト列全体でのNULバイトの位置の偏りから判定する
+
+    UTF-8やShift_JISのテキストにはほとんどNULバイトが含まれないため、NULバイトが
+    ある程度の割合で2バイトおき（UTF-16）または4バイトおき（UTF-32）の片側に
+    偏っている場合だけそれと判定する。紛れ込んだ少数のNULバイトでは判定しない。
+    """
+    # 先頭の読み込みがファイル全体の場合、長さが文字の単位で割り切れなければその文字コードではない
+    whole = len(prefix) < ENCODING_PROBE_SIZE
+    length = len(prefix) - len(prefix) % 4
+    if length >= 4 and not (whole and len(prefix) % 4):
+        # UTF-32では最上位バイトが常にNULになり、基本多言語面の文字なら次のバイトもNULになる
+        quads = length // 4
+        counts = [prefix[offset:length:4].count(0) for offset in range(4)]
+        if counts[0] == quads and counts[1] * 2 > quads and counts[3] < quads:
+            return "utf-32-be"
+        if counts[3] == quads and counts[2] * 2 > quads and counts[0] < quads:
+            return "utf-32-le"
+    if whole and len(prefix) % 2:
+        return None
+    units = len(prefix) // 2
+    even = prefix[0:units * 2:2].count(0)
+    odd = prefix[1:units * 2:2].count(0)
+    # ASCIIの文字や改行は片側がNULになる（U+3000などで反対側がNULになる場合もある）
+    nuls = max(even, odd)
+    if nuls < 2 or nuls * WIDE_NUL_RATIO < units:
+        return None
+    if odd > even * 4:
+        return "utf-16-le"
+    if even > odd * 4:
+        return "utf-16-be"
+    return None
+
+
+def detect_encoding(prefix):
+    """ファイルの先頭のバイト列から文字コードを判定する
+
+    BOM、UTF-16/32のNULバイトの並び、XML宣言や coding: コメントの順に調べ、
+    どれにも当てはまらなければUTF-8として読めるかどうかで判定する。
+    (文字コード, BOMのバイト数, 判定が確実かどうか) を返す。
+    先頭がASCIIだけの場合はUTF-8と判定するが、確実ではないものとして扱う。
+    """
+    for bom, encoding in _BOMS:
+        if prefix.startswith(bom):
+            return encoding, len(bom), True
+    encoding = _detect_wide_encoding(prefix)
+    if encoding is not None:
+        return encoding, 0, True
+    declared = _declared_encoding(prefix)
+    if declared is not None:
+        return declared, 0, True
+    try:
+        # 末尾で切れたマルチバイト文字はエラーにしない
+        codecs.getincrementaldecoder("utf-8")().decode(prefix, final=False)
+    except UnicodeDecodeError:
+        return FALLBACK_ENCODING, 0, True
+    return "utf-8", 0, not prefix.isascii()
+
+
+def decode_file_data(data, final=True, head=None):
+    """ファイルのバイト列の文字コードを判定し、改行コードを変換しながら1回でデコードする
+
+    (内容, 文字コード, BOMの有無, 改行コード, デコーダー) を返す。
+    final=False の場合は末尾で切れた文字をデコーダーに残し、追記分の読み込みに使える。
+    dataがファイルの途中から始まる場合は、文字コードの判定に使うファイルの先頭をheadに渡す。
+    """
+    probe = data if head is None else head
+    encoding, bom_length, certain = detect_encoding(probe[:ENCODING_PROBE_SIZE])
+    bom = bool(bom_length)
+    if head is not None:
+        bom_length = 0
+    # BOMがない場合はコピーせずにそのままデコードする
+    body = memoryview(data)[bom_length:] if bom_length else data
+    while True:
+        decoder = io.IncrementalNewlineDecoder(codecs.getincrementaldecoder(encoding)(), translate=True)
+        try:
+            content = decoder.decode(body, final=final)
+            break
+        except UnicodeDecodeError:
+            if certain:
+                raise
+            # 先頭がASCIIだけでUTF-8と判定した場合のみ、一度だけ読み直す
+            encoding, certain = FALLBACK_ENCODING, True
+    newlines = decoder.newlines
+    if isinstance(newlines, tuple):
+        # 改行コードが混在している場合はCRLFを優先する
+        newlines = "\r\n" if "\r\n" in newlines else newlines[0]
+    return content, encoding, bom, newlines, decoder
+
+
+def find_tail_start(file, size, head, max_lines):
+    """ファイルの末尾から max_lines 行を少し超える分の開始位置を探す
+
+    末尾からブロック単位で読み戻して改行を数えるため、ファイル全体は読み込まない。
+    改行が足りなければ0（ファイルの先頭）を返す。
+    """
+    encoding, bom_length, _ = detect_encoding(head[:ENCODING_PROBE_SIZE])
+    newline = "\n".encode(encoding)
+    unit = len(newline)  # UTF-16/32では文字の境界に合わせて改行を探す
+    position = size - (size - bom_length) % unit
+    # ブロックの大きさはunitの倍数なので、各ブロックの先頭は常に文字の境界になる
+    block_size = FOLLOW_TAIL_BLOCK_SIZE - FOLLOW_TAIL_BLOCK_SIZE % unit
+    count = 0
+    while position > bom_length:
+        start = max(bom_length, position - block_size)
+        file.seek(start)
+        block = file.read(position - start)
+        end = len(block)
+        while True:
+            index = block.rfind(newline, 0, end)
+            if index < 0:
+                break
+            if index % unit == 0:
+                count += 1
+                if count > max_lines:
+                    return start + index + unit
+            end = index + unit - 1
+        position = start
+    return 0
+
+
+def read_text_file(path):
+    """文字コードを判定してファイルを読み込み、(内容, 文字コード, BOMの有無, 改行コード) を返す"""
+    with open(path, "rb") as file:
+        data = file.read()
+    return decode_file_data(data)[:4]
+
+
+def encoding_label(encoding, bom, newline):
+    """ステータスバーに表示する文字コードと改行コードの名前"""
+    names = {"cp932": "Shift_JIS", "euc_jp": "EUC-JP", "iso2022_jp": "ISO-2022-JP"}
+    label = names.get(encoding, encoding.upper().replace("_", "-"))
+    if bom:
+        label += " (BOM付き)"
+    newline_names = {"\r\n": "CRLF", "\n": "LF", "\r": "CR"}
+    if newline in newline_names:
+        label += f" / {newline_names[newline]}"
+    return label
+
+
+def has_long_line(text):
+    """LONG_LINE_LENGTH を超える行が含まれているか"""
+    return len(text) > LONG_LINE_LENGTH and _LONG_LINE.search(text) is not None
+
+
+def soft_chunk_args(text):
+    """長い行を分割して Text.insert に渡す (文字列, タグ, ...) の引数列を作る
+
+    分割位置には SOFT_BREAK_TAG を付けた改行を入れる。
+    """
+    args = []
+    start = 0
+    for match in _LONG_LINE.finditer(text):
+        line_start, line_end = match.span()
+        args.extend((text[start:line_start], ()))
+        for chunk_start in range(line_start, line_end - LONG_LINE_LENGTH, LONG_LINE_LENGTH):
+            args.extend((text[chunk_start:chunk_start + LONG_LINE_LENGTH], (), "\n", SOFT_BREAK_TAG))
+            start = chunk_start + LONG_LINE_LENGTH
+    args.extend((text[start:], ()))
+    return args
+
+
+def looks_formattable(text):
+    """先頭の文字からJSONまたはXMLとして整形できそうかを判定する（解析はしない）"""
+    match = re.search(r"\S", text[:ENCODING_PROBE_SIZE])
+    return match is not None and match.group() in "{[<"
+
+
+def pretty_format(text):
+    """JSONまたはXMLとして整形できれば整形したテキストを返す（できなければNone）"""
+    try:
+        return json.dumps(json.loads(text), ensure_ascii=False, indent=2)
+    except (ValueError, RecursionError):
+        pass
+    if text.lstrip().startswith("<"):
+        try:
+            return minidom.parseString(text).toprettyxml(indent="  ")
+        except Exception:
+            pass
+    return None
+
+
+def offset_to_position(text, offset):
+    """文字オフセットを (行, 列) に変換する（行は1始まり、列は0始まり）"""
+    line_start = text.rfind("\n", 0, offset) + 1
+    return text.count("\n", 0, offset) + 1, offset - line_start
+
+
+def records_to_json_lines(records):
+    """レコードを1件ずつJSON Linesの行に変換する"""
+    for record in records:
+        yield json.dumps(record, ensure_ascii=False, separators=(",", ":"), default=_expand_table) + "\n"
+
+
+def records_to_json_array(records):
+    """レコードを1件ずつ json.dumps(indent=2) と同じ形式のJSON配列に変換する"""
+    empty = True
+    for record in records:
+        yield "[\n  " if empty else ",\n  "
+        yield from iter_json_chunks(record, 2, 1)
+        empty = False
+    yield "[]" if empty else "\n]"
+
+
+def records_to_delimited(records, delimiter=",", nested="flatten", sep=".",
+                         sample_size=CSV_SAMPLE_SIZE, dropped_columns=None):
+    """レコードを1件ずつCSV/TSVの行に変換する
+
+    列は先頭 sample_size 件から推定する。サンプル以降に初めて現れた列は
+    出力せず、dropped_columns が渡されていればその列名を追加する。
+    """
+    flat_records = (flatten_record(record, nested, sep) for record in records)
+    sample = list(itertools.islice(flat_records, sample_size))
+    columns = infer_columns(sample)
+    known = set(columns)
+
+    buffer = io.StringIO()
+    writer = csv.writer(buffer, delimiter=delimiter, lineterminator="\n")
+    writer.writerow(columns)
+    for record in itertools.chain(sample, flat_records):
+        if dropped_columns is not None and not known.issuperset(record):
+            dropped_columns.update(key for key in record if key not in known)
+        writer.writerow([_to_cell(record.get(column)) for column in columns])
+        yield buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+    if buffer.tell():
+        yield buffer.getvalue()
+
+class RecordTable(Sequence):
+    """同じキーを持つレコードの配列をキー1組と値のタプルで保持する
+
+    要素を参照するたびにdictを組み立てて返すため、シリアライザーからは
+    通常のdictのリストと同じように扱える。
+    """
+    __slots__ = ("keys", "rows")
+
+    def __init__(self, keys, rows):
+        self.keys = keys
+        self.rows = rows
+
+    def __len__(self):
+        return len(self.rows)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [dict(zip(self.keys, row)) for row in self.rows[index]]
+        return dict(zip(self.keys, self.rows[index]))
+
+    def __iter__(self):
+        keys = self.keys
+        for row in self.rows:
+            yield dict(zip(keys, row))
+
+
+# yaml.dump でRecordTableを通常のリストとして出力する
+yaml.add_representer(RecordTable, lambda dumper, data: dumper.represent_list(data))
+
+
+class _PackedObject(tuple):
+    """省メモリモードのJSON読み込み中にオブジェクトを (キー, 値) のタプルで保持する"""
+    __slots__ = ()
+
+
+def _record_keys(value):
+    """レコードとして扱える値ならキーのタプルを返す"""
+    if type(value) is _PackedObject:
+        return value[0]
+    if isinstance(value, dict):
+        return tuple(value)
+    return None
+
+
+def _compact_table(items, memo):
+    """同じキーを持つレコードのリストをRecordTableに変換する（該当しなければNone）"""
+    if len(items) < 2:
+        return None
+    keys = _record_keys(items[0])
+    if keys is None or any(_record_keys(item) != keys for item in items):
+        return None
+    keys = tuple(memo.setdefault(key, key) if isinstance(key, str) else key for key in keys)
+    rows = []
+    for index, item in enumerate(items):
+        values = item[1] if type(item) is _PackedObject else item.values()
+        rows.append(tuple(_compact(value, memo) for value in values))
+        # 変換済みのレコードはすぐに解放する
+        items[index] = None
+    return RecordTable(keys, rows)
+
+
+def _compact(value, memo):
+    """キーと短い文字列を共有し、同じ形のレコード配列をRecordTableに置き換える"""
+    if isinstance(value, str):
+        return memo.setdefault(value, value) if len(value) <= INTERN_MAX_LENGTH else value
+    if type(value) is _PackedObject:
+        keys, values = value
+        return dict(zip(keys, (_compact(item, memo) for item in values)))
+    if isinstance(value, dict):
+        return {memo.setdefault(key, key) if isinstance(key, str) else key: _compact(item, memo)
+                for key, item in value.items()}
+    if isinstance(value, list):
+        table = _compact_table(value, memo)
+        if table is not None:
+            return table
+        for index, item in enumerate(value):
+            value[index] = _compact(item, memo)
+    return value
+
+
+def compact_data(data):
+    """yaml.safe_load や xmltodict.parse の結果を省メモリな表現に変換する"""
+    return _compact(data, {})
+
+
+def load_json_compact(text):
+    """JSONを省メモリな表現で読み込む
+
+    オブジェクトはまずキーのタプルを共有した (キー, 値) の組として読み込み、
+    dictの生成をレコード配列の判定後まで遅らせる。
+    """
+    key_tuples = {}
+
+    def pack(pairs):
+        keys = tuple(key for key, _ in pairs)
+        return _PackedObject((key_tuples.setdefault(keys, keys), tuple(value for _, value in pairs)))
+
+    return _compact(json.loads(text, object_pairs_hook=pack), key_tuples)
+
+
+def _expand_table(value):
+    """json.dumps の default として、RecordTableをdictのリストに展開する"""
+    if isinstance(value, RecordTable):
+        return list(value)
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+class _ContainsTable(Exception):
+    """json.dumps で直接出力できないRecordTableが含まれている"""
+
+
+def _reject_table(value):
+    if isinstance(value, RecordTable):
+        raise _ContainsTable()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def _json_key(key):
+    """json.dumps と同じ規則でdictのキーを文字列に変換する"""
+    if isinstance(key, str):
+        return key
+    if key is True:
+        return "true"
+    if key is False:
+        return "false"
+    if key is None:
+        return "null"
+    if isinstance(key, (int, float)):
+        return json.dumps(key)
+    raise TypeError(f"keys must be str, int, float, bool or None, not {type(key).__name__}")
+
+
+def iter_json_chunks(data, indent=2, _level=0):
+    """RecordTableを含むデータを json.dumps(indent=indent) と同じ形式で少しずつ出力する"""
+    padding = "\n" + " " * (indent * _level)
+    try:
+        text = json.dumps(data, ensure_ascii=False, indent=indent, default=_reject_table)
+    except _ContainsTable:
+        pass
+    else:
+        # RecordTableを含まない部分はjson.dumpsでまとめて出力する
+        yield text.replace("\n", padding) if _level else text
+        return
+
+    inner = padding + " " * indent
+    if isinstance(data, dict):
+        if not data:
+            yield "{}"
+            return
+        first = True
+        for key, value in data.items():
+            yield ("{" if first else ",") + inner + json.dumps(_json_key(key), ensure_ascii=False) + ": "
+            yield from iter_json_chunks(value, indent, _level + 1)
+            first = False
+        yield padding + "}"
+    else:
+        first = True
+        for item in data:
+            yield ("[" if first else ",") + inner
+            yield from iter_json_chunks(item, indent, _level + 1)
+            first = False
+        yield "[]" if first else padding + "]"
+
+
+class ConversionLimitError(Exception):
+    """変換時の制限を超えた"""
+
+
+class ConversionGuard:
+    """変換1回分の制限（エイリアスの展開数・ネストの深さ・出力サイズ・処理時間）を管理する"""
+
+    def __init__(self, max_alias_expansions, max_depth, max_output_size, timeout):
+        self.max_alias_expansions = max_alias_expansions
+        self.max_depth = max_depth
+        self.max_output_size = max_output_size
+        self.timeout = timeout
+        self.deadline = time.monotonic() + timeout
+        self.alias_expansions = 0
+        self.output_size = 0
+        self._ticks = 0
+
+    def check_time(self):
+        """処理時間の制限を超えていないか確認する"""
+        if time.monotonic() > self.deadline:
+            raise ConversionLimitError(f"処理時間が制限（{self.timeout}秒）を超えました")
+
+    def tick(self):
+        """一定の回数ごとに処理時間を確認する"""
+        self._ticks += 1
+        if self._ticks >= TIME_CHECK_INTERVAL:
+            self._ticks = 0
+            self.check_time()
+
+    def check_nesting(self, depth):
+        if depth > self.max_depth:
+            raise ConversionLimitError(f"ネストの深さが制限（{self.max_depth}）を超えました")
+
+    def check_depth(self, data):
+        """読み込んだデータのネストの深さを確認して、そのまま返す"""
+        # 1段ずつまとめて子要素を集め、要素ごとのPythonの処理を内包表記の中だけに抑える
+        # RecordTableは行のタプルを経由させ、各行をdictとして1段に数える
+        containers = {dict, list, tuple, RecordTable}
+        from_iterable = itertools.chain.from_iterable
+        level = [data] if type(data) in containers else []
+        depth = 0
+        while level:
+            depth += 1
+            self.check_nesting(depth)
+            children = from_iterable([
+                value.values() if type(value) is dict
+                else value.rows if type(value) is RecordTable
+                else value
+                for value in level])
+            level = [child for child in children if type(child) in containers]
+        return data
+
+    def add_alias_expansion(self, count):
+        self.alias_expansions += count
+        if self.alias_expansions > self.max_alias_expansions:
+            raise ConversionLimitError(
+                f"YAMLのエイリアスの展開数が制限（{self.max_alias_expansions}）を超えました")
+
+    def add_output(self, size):
+        self.output_size += size
+        if self.output_size > self.max_output_size:
+            raise ConversionLimitError(f"出力サイズが制限（{self.max_output_size}文字）を超えました")
+
+    def join(self, chunks):
+        """出力を少しずつ受け取り、出力サイズと処理時間を確認しながら連結する"""
+        pieces = []
+        # 空の出力を除いておき、連結結果が空になったら終わりとみなす
+        chunks = filter(None, chunks)
+        while True:
+            # 細かい出力を TIME_CHECK_INTERVAL 個ずつ連結してから確認し、オーバーヘッドを抑える
+            piece = "".join(itertools.islice(chunks, TIME_CHECK_INTERVAL))
+            if not piece:
+                return "".join(pieces)
+            self.add_output(len(piece))
+            self.check_time()
+            pieces.append(piece)
+
+    def writer(self):
+        """yaml.dump の出力先として使う、制限を確認するストリーム（Dumper=GuardedDumper と組み合わせる）"""
+        return _GuardedWriter(self)
+
+    def xml_item_name(self, parent):
+        """dicttoxml の item_func として、リストの要素ごとに処理時間を確認する"""
+        self.tick()
+        return "item"
+
+    def xml_chunks(self, text):
+        """xmltodict.parse に少しずつ渡すUTF-8のバイト列を返し、渡すたびに処理時間を確認する
+
+        要素ごとに呼ばれる postprocessor を使わないため、ネストの深さは読み込み後に確認する。
+        """
+        for start in range(0, len(text), XML_CHUNK_SIZE):
+            self.check_time()
+            yield text[start:start + XML_CHUNK_SIZE].encode("utf-8")
+
+
+class _GuardedWriter:
+    """yaml.dump の出力先として、書き込まれた文字列をリストに溜めるストリーム
+
+    書き込みのたびにPythonの処理を挟まないよう、確認は GuardedDumper からノード単位で行う。
+    """
+
+    def __init__(self, guard):
+        self.guard = guard
+        self.pieces = []
+        self.write = self.pieces.append
+        self._ticks = 0
+        self._checked = 0
+
+    def tick(self):
+        """TIME_CHECK_INTERVAL 回ごとに、それまでの出力サイズと処理時間を確認する"""
+        self._ticks += 1
+        if self._ticks >= TIME_CHECK_INTERVAL:
+            self._ticks = 0
+            self.check()
+
+    def check(self):
+        pieces = self.pieces
+        self.guard.add_output(sum(map(len, itertools.islice(pieces, self._checked, None))))
+        self._checked = len(pieces)
+        self.guard.check_time()
+
+    def getvalue(self):
+        self.check()
+        return "".join(self.pieces)
+
+
+class GuardedDumper(yaml.Dumper):
+    """出力先の _GuardedWriter でノードごとに制限を確認しながら出力するYAMLダンパー"""
+
+    def serialize_node(self, node, parent, index):
+        self.stream.tick()
+        super().serialize_node(node, parent, index)
+
+
+class GuardedSafeLoader(yaml.SafeLoader):
+    """エイリアスの展開数・ネストの深さ・処理時間を確認しながら読み込むYAMLローダー"""
+
+    def __init__(self, stream, guard):
+        super().__init__(stream)
+        self.guard = guard
+        self._depth = 0
+        self._expanded_sizes = {}
+
+    def compose_node(self, parent, index):
+        self.guard.tick()
+        if self.check_event(yaml.AliasEvent):
+            node = self.anchors.get(self.peek_event().anchor)
+            if node is not None:
+                self.guard.add_alias_expansion(self._expanded_size(node))
+        self._depth += 1
+        self.guard.check_nesting(self._depth)
+        try:
+            return super().compose_node(parent, index)
+        finally:
+            self._depth -= 1
+
+    def _expanded_size(self, node):
+        """エイリアスをすべて展開したときのノード数"""
+        sizes = self._expanded_sizes
+        size = sizes.get(id(node))
+        if size is None:
+            # 構築中のノードを参照するエイリアスは無限に展開される
+            raise ConversionLimitError("YAMLに自分自身を参照するエイリアスが含まれています")
+        return size
+
+    def compose_scalar_node(self, anchor):
+        node = super().compose_scalar_node(anchor)
+        self._expanded_sizes[id(node)] = 1
+        return node
+
+    def compose_sequence_node(self, anchor):
+        node = super().compose_sequence_node(anchor)
+        self._expanded_sizes[id(node)] = 1 + sum(self._expanded_sizes[id(item)] for item in node.value)
+        return node
+
+    def compose_mapping_node(self, anchor):
+        node = super().compose_mapping_node(anchor)
+        self._expanded_sizes[id(node)] = 1 + sum(
+            self._expanded_sizes[id(key)] + self._expanded_sizes[id(value)] for key, value in node.value)
+        return node
+
+
+def load_yaml_guarded(text, guard):
+    """GuardedSafeLoader でYAMLを読み込み、エイリアスを展開した後のネストの深さを確認する"""
+    loader = GuardedSafeLoader(text, guard)
+    try:
+        data = loader.get_single_data()
+    finally:
+        loader.dispose()
+    # 読み込み中はエイリアスの先の深さを数えないため、展開後の構造で確認する
+    return guard.check_depth(data)
+
+
+def load_json_guarded(text, guard, compact=False):
+    """JSONを読み込み、ネストの深さを確認する（compact=True では省メモリな表現で読み込む）"""
+    data = load_json_compact(text) if compact else json.loads(text)
+    return guard.check_depth(data)
+
+
+def load_xml_guarded(text, guard):
+    """XMLを少しずつ渡して処理時間を確認しながら読み込み、ネストの深さを確認する"""
+    return guard.check_depth(xmltodict.parse(guard.xml_chunks(text), encoding="utf-8"))
+
+
+def dump_json_guarded(data, guard, compact=False):
+    """出力サイズと処理時間を確認しながらインデント付きのJSONに変換する"""
+    if compact:
+        # RecordTableを含むデータもそのまま出力できる
+        chunks = iter_json_chunks(data, 2)
+    else:
+        chunks = json.JSONEncoder(ensure_ascii=False, indent=2).iterencode(data)
+    return guard.join(chunks)
+
+
+def dump_yaml_guarded(data, guard, **kwargs):
+    """出力サイズと処理時間を確認しながらYAMLに変換する"""
+    stream = guard.writer()
+    yaml.dump(data, stream, Dumper=GuardedDumper, allow_unicode=True, sort_keys=False, **kwargs)
+    return stream.getvalue()
+
+
+def dump_xml_guarded(data, guard):
+    """処理時間を確認しながらXMLに変換し、出力サイズを確認する"""
+    xml_data = dicttoxml.dicttoxml(data, custom_root='root', attr_type=False, item_func=guard.xml_item_name)
+    guard.add_output(len(xml_data))
+    # バイト列を文字列に変換
+    return xml_data.decode('utf-8')
+
+
 class JSONYAMLNotepad:
     def __init__(self, root):
         self.root = root
@@ -17,8 +888,22 @@ class JSONYAMLNotepad:
         
         # 現在のファイルパス
         self.current_file = None
+        # 現在のファイルの文字コード・BOMの有無・改行コード（保存時に使う）
+        self.file_encoding = "utf-8"
+        self.file_bom = False
+        self.file_newline = None
+        
+        # 追跡モードの状態
+        self.follow_job = None
+        self.follow_offset = 0
+        self.follow_stat = None
+        self.follow_head = b""
+        self.follow_decoder = None
+        # フラグ: 追跡中に古い行を削除して末尾のみ表示しているかどうか
+        self.follow_trimmed = False
         
         # Undo/Redo用の履歴スタック
+        # Tkの元に戻す履歴を消すときに (置き換え前, 置き換え後) の内容を積む
         self.undo_stack = []
         self.redo_stack = []
         
@@ -58,7 +943,13 @@ class JSONYAMLNotepad:
         # テキストが変更されたときのイベントを監視
         self.text_area.bind("<<Modified>>", self.on_text_modified)
         self.text_area.bind("<Key>", self.on_key_press)
+        # 分割表示中は表示上の分割用の改行を除いてコピー・切り取りする
+        self.text_area.bind("<<Copy>>", self.copy_selection)
+        self.text_area.bind("<<Cut>>", lambda event: self.copy_selection(event, cut=True))
         self.last_content = ""
+        # フラグ: 長い行を表示上だけ分割しているかどうか
+        self.soft_chunked = False
+        self.text_area.tag_config(SOFT_BREAK_TAG)
         # フラグ: 未保存の変更があるかどうか
         self.unsaved_changes = False
         
@@ -74,6 +965,16 @@ class JSONYAMLNotepad:
         self.file_menu.add_command(label="保存", command=self.save_file, accelerator="Ctrl+S")
         self.file_menu.add_command(label="名前を付けて保存", command=self.save_as, accelerator="Ctrl+Shift+S")
         self.file_menu.add_separator()
+        # 追跡モード（ファイルの末尾に追記された内容を読み込み続ける）
+        self.follow_var = tk.BooleanVar(value=False)
+        self.file_menu.add_checkbutton(label="末尾を追跡", variable=self.follow_var, command=self.toggle_follow)
+        self.follow_max_lines = tk.IntVar(value=0)
+        self.follow_menu = Menu(self.file_menu, tearoff=0)
+        self.file_menu.add_cascade(label="追跡時に保持する行数", menu=self.follow_menu)
+        for max_lines in (0, 1000, 10000, 100000):
+            self.follow_menu.add_radiobutton(label=f"{max_lines}行" if max_lines else "無制限",
+                                             variable=self.follow_max_lines, value=max_lines)
+        self.file_menu.add_separator()
         self.file_menu.add_command(label="印刷", command=self.print_file, accelerator="Ctrl+P")
         self.file_menu.add_separator()
         self.file_menu.add_command(label="終了", command=self.exit_app)
@@ -123,6 +1024,36 @@ class JSONYAMLNotepad:
         self.convert_menu.add_command(label="XMLからYAMLへ変換", command=self.xml_to_yaml, accelerator="F12")
         self.convert_menu.add_separator()
         self.convert_menu.add_command(label="XMLフォーマット整形", command=self.format_xml, accelerator="Ctrl+F12")
+        self.convert_menu.add_separator()
+        # 大きなデータ向けの省メモリ読み込み
+        self.compact_mode = tk.BooleanVar(value=False)
+        self.convert_menu.add_checkbutton(label="省メモリモードで読み込む", variable=self.compact_mode)
+        # 変換時の制限（エイリアスの展開数・ネストの深さ・出力サイズ・処理時間）
+        self.conversion_limits = dict(DEFAULT_CONVERSION_LIMITS)
+        self.convert_menu.add_command(label="変換の制限設定", command=self.edit_conversion_limits)
+        self.convert_menu.add_separator()
+        # レコード配列（JSON Lines/CSV/TSV）変換メニュー項目を追加
+        self.convert_menu.add_command(label="JSONからJSON Linesへ変換", command=self.json_to_jsonl)
+        self.convert_menu.add_command(label="JSON LinesからJSONへ変換", command=self.jsonl_to_json)
+        self.convert_menu.add_command(label="JSONからCSVへ変換", command=self.json_to_csv)
+        self.convert_menu.add_command(label="CSVからJSONへ変換", command=self.csv_to_json)
+        self.convert_menu.add_command(label="JSONからTSVへ変換", command=self.json_to_tsv)
+        self.convert_menu.add_command(label="TSVからJSONへ変換", command=self.tsv_to_json)
+        
+        # CSV/TSV変換時のネストしたフィールドの扱い
+        self.nested_mode = tk.StringVar(value="flatten")
+        self.flatten_separator = tk.StringVar(value=".")
+        self.nested_menu = Menu(self.convert_menu, tearoff=0)
+        self.convert_menu.add_cascade(label="CSV/TSVのネスト設定", menu=self.nested_menu)
+        self.nested_menu.add_radiobutton(label="区切り文字でキーを展開", variable=self.nested_mode, value="flatten")
+        self.nested_menu.add_radiobutton(label="JSON文字列として格納", variable=self.nested_mode, value="json")
+        self.nested_menu.add_separator()
+        for separator in (".", "_", "/"):
+            self.nested_menu.add_radiobutton(label=f"区切り文字: {separator}", variable=self.flatten_separator, value=separator)
+        self.nested_menu.add_separator()
+        # CSV/TSVからの変換で数値・true・false・nullを復元するかどうか
+        self.typed_cells = tk.BooleanVar(value=False)
+        self.nested_menu.add_checkbutton(label="値の型を復元（数値・true・false・null）", variable=self.typed_cells)
         
         # ヘルプメニュー
         self.help_menu = Menu(self.menu_bar, tearoff=0)
@@ -173,17 +1104,225 @@ class JSONYAMLNotepad:
         self.char_count = tk.Label(self.status_bar, text="文字数: 0")
         self.char_count.pack(side=tk.RIGHT, padx=5)
         
+        # カーソル位置表示用のステータスバー部分（ファイル上の行・列を表示）
+        self.caret_position = tk.Label(self.status_bar, text="行 1, 列 1")
+        self.caret_position.pack(side=tk.RIGHT, padx=5)
+        self.text_area.bind("<KeyRelease>", self.update_caret_position)
+        self.text_area.bind("<ButtonRelease-1>", self.update_caret_position)
+        
+        # 文字コード表示用のステータスバー部分
+        self.encoding_status = tk.Label(self.status_bar, text=encoding_label("utf-8", False, None))
+        self.encoding_status.pack(side=tk.RIGHT, padx=5)
+        
+        # 長い行を分割表示しているときの表示
+        self.display_mode = tk.Label(self.status_bar, text="")
+        self.display_mode.pack(side=tk.RIGHT, padx=5)
+        
         # テキスト変更時に文字数を更新
         self.text_area.bind("<<Modified>>", self.update_char_count)
 
         # ウィンドウを閉じるときの確認処理を登録
         self.root.protocol("WM_DELETE_WINDOW", self.exit_app)
     
+    def get_content(self):
+        """テキストエリアの内容を取得（表示上の分割用の改行は除く）"""
+        if not self.soft_chunked:
+            return self.text_area.get("1.0", tk.END+"-1c")
+        ranges = self.text_area.tag_ranges(SOFT_BREAK_TAG)
+        pieces = []
+        start = "1.0"
+        for i in range(0, len(ranges), 2):
+            pieces.append(self.text_area.get(start, ranges[i]))
+            start = ranges[i + 1]
+        pieces.append(self.text_area.get(start, tk.END+"-1c"))
+        return "".join(pieces)
+    
+    def get_text(self, start, end):
+        """指定した範囲のテキストを取得（表示上の分割用の改行は除く）"""
+        if not self.soft_chunked:
+            return self.text_area.get(start, end)
+        pieces = []
+        while True:
+            found = self.text_area.tag_nextrange(SOFT_BREAK_TAG, start, end)
+            if not found:
+                pieces.append(self.text_area.get(start, end))
+                return "".join(pieces)
+            pieces.append(self.text_area.get(start, found[0]))
+            start = found[1]
+    
+    def copy_selection(self, event=None, cut=False):
+        """分割表示中のコピー・切り取り（クリップボードに分割用の改行を含めない）"""
+        if not self.soft_chunked:
+            # 通常はTk標準のコピー・切り取りを使う
+            return None
+        try:
+            start = self.text_area.index(tk.SEL_FIRST)
+            end = self.text_area.index(tk.SEL_LAST)
+        except tk.TclError:
+            return "break"  # 選択がない場合は何もしない
+        self.text_area.clipboard_clear()
+        self.text_area.clipboard_append(self.get_text(start, end))
+        if cut:
+            self.text_area.delete(start, end)
+        return "break"
+    
+    def content_length(self):
+        """内容の文字数を取得（表示上の分割用の改行は数えない）"""
+        chars = self.text_area.count("1.0", tk.END+"-1c", "chars")
+        chars = (chars[0] if isinstance(chars, tuple) else chars) or 0
+        if self.soft_chunked:
+            chars -= len(self.text_area.tag_ranges(SOFT_BREAK_TAG)) // 2
+        return chars
+    
+    def set_content(self, content, keep_history=True):
+        """テキストエリアの内容を置き換える（長い行は表示上だけ分割する）
+
+        Tkの元に戻す履歴を消す場合は、keep_history が真なら置き換え前の内容を undo_stack に残す。
+        """
+        chunked = has_long_line(content)
+        reset = chunked or self.soft_chunked
+        if reset:
+            if keep_history:
+                self.push_undo_snapshot(self.get_content(), content)
+            # Tkの元に戻す履歴はタグを復元しないため、分割表示が関わる置き換えは履歴に残さない
+            self.text_area.config(undo=False)
+        self.text_area.delete("1.0", tk.END)
+        if chunked:
+            self.text_area.insert(tk.END, *soft_chunk_args(content))
+        else:
+            self.text_area.insert(tk.END, content)
+        if reset:
+            # 分割表示中は履歴を無効にする
+            self.text_area.config(undo=not chunked)
+            self.text_area.edit_reset()
+        self.soft_chunked = chunked
+        # 分割表示中は選択範囲をそのまま他へ渡さない（中クリックでの貼り付け対策）
+        self.text_area.config(exportselection=not chunked)
+        self.update_display_mode()
+        self.update_caret_position()
+    
+    def push_undo_snapshot(self, before, after):
+        """Tkの元に戻す履歴の代わりに、置き換え前後の内容を記録する"""
+        if before == after:
+            return
+        self.undo_stack.append((before, after))
+        del self.undo_stack[:-UNDO_SNAPSHOT_LIMIT]
+        self.redo_stack.clear()
+    
+    def restore_snapshot(self, content):
+        """undo_stack・redo_stack に記録した内容に戻す"""
+        self.set_content(content, keep_history=False)
+        # 戻した後の編集は、記録した内容を境にTkの履歴でたどる
+        self.text_area.edit_reset()
+        self.last_content = content
+        self.char_count.config(text=f"文字数: {self.content_length()}")
+    
+    def append_content(self, content):
+        """テキストエリアの末尾に追加する（長い行は表示上だけ分割する）"""
+        if has_long_line(content):
+            if not self.soft_chunked:
+                self.text_area.config(undo=False)
+                self.text_area.edit_reset()
+                self.soft_chunked = True
+                self.text_area.config(exportselection=False)
+                self.update_display_mode()
+            self.text_area.insert(tk.END, *soft_chunk_args(content))
+        else:
+            self.text_area.insert(tk.END, content)
+    
+    def update_display_mode(self):
+        """ステータスバーに表示の状態（ファイルの一部のみ・長い行の分割）を表示"""
+        modes = []
+        if self.follow_trimmed:
+            modes.append("ファイルの末尾のみ表示中")
+        if self.soft_chunked:
+            modes.append("長い行を分割表示中")
+        self.display_mode.config(text="・".join(modes))
+    
+    def set_follow_trimmed(self, trimmed):
+        """ファイルの一部のみを表示しているかどうかを設定"""
+        self.follow_trimmed = trimmed
+        self.update_display_mode()
+    
+    def offer_pretty_print(self, content):
+        """長い行があれば整形して開くかを確認し、(内容, 整形したかどうか) を返す"""
+        if not has_long_line(content) or not looks_formattable(content):
+            return content, False
+        # 大きなファイルの解析は、整形すると選ばれた場合にだけ行う
+        if not messagebox.askyesno(
+                "長い行", "非常に長い行が含まれています。整形してから表示しますか？\n"
+                "「いいえ」を選ぶと、保存内容は変えずに表示上だけ分割します。"):
+            return content, False
+        formatted = pretty_format(content)
+        if formatted is None:
+            messagebox.showinfo("情報", "JSONまたはXMLとして整形できなかったため、表示上だけ分割します")
+            return content, False
+        return formatted, True
+    
+    def soft_break_lines(self):
+        """表示上の分割用の改行で終わる表示行の番号一覧"""
+        ranges = self.text_area.tag_ranges(SOFT_BREAK_TAG)
+        return [int(str(index).split(".")[0]) for index in ranges[::2]]
+    
+    def true_position(self, index):
+        """表示上の位置をファイル上の (行, 列) に変換する（行は1始まり、列は0始まり）"""
+        line, column = map(int, self.text_area.index(index).split("."))
+        if not self.soft_chunked:
+            return line, column
+        breaks = self.soft_break_lines()
+        before = bisect_left(breaks, line)
+        # 分割された行の先頭の表示行まで遡る
+        start = line
+        i = before
+        while i > 0 and breaks[i - 1] == start - 1:
+            start -= 1
+            i -= 1
+        if start != line:
+            chars = self.text_area.count(f"{start}.0", f"{line}.{column}", "chars")
+            chars = chars[0] if isinstance(chars, tuple) else chars
+            # 途中の分割用の改行の分を差し引く
+            column = chars - (line - start)
+        return line - before, column
+    
+    def display_index(self, line, column):
+        """ファイル上の (行, 列) を表示上の位置に変換する"""
+        if not self.soft_chunked:
+            return f"{line}.{column}"
+        breaks = self.soft_break_lines()
+        display_line = line
+        for break_line in breaks:
+            if break_line >= display_line:
+                break
+            display_line += 1
+        # 分割された表示行をたどって列の位置を探す
+        break_set = set(breaks)
+        while display_line in break_set:
+            length = int(self.text_area.index(f"{display_line}.end").split(".")[1])
+            if column <= length:
+                break
+            column -= length
+            display_line += 1
+        return f"{display_line}.{column}"
+    
+    def search_true_content(self, query):
+        """分割表示中にファイル上の内容で検索し、表示上の (開始, 終了) 位置を返す"""
+        content = self.get_content()
+        offset = content.find(query)
+        if offset < 0:
+            return "", ""
+        start_pos = self.display_index(*offset_to_position(content, offset))
+        end_pos = self.display_index(*offset_to_position(content, offset + len(query)))
+        return start_pos, end_pos
+    
+    def update_caret_position(self, event=None):
+        """カーソル位置の表示を更新"""
+        line, column = self.true_position(tk.INSERT)
+        self.caret_position.config(text=f"行 {line}, 列 {column + 1}")
+    
     def on_text_modified(self, event=None):
         """テキストが変更されたときに呼ばれるメソッド"""
         if self.text_area.edit_modified():
-            content = self.text_area.get("1.0", tk.END+"-1c")
-            self.char_count.config(text=f"文字数: {len(content)}")
+            self.char_count.config(text=f"文字数: {self.content_length()}")
             # 未保存フラグをセット
             self.unsaved_changes = True
             # 文字数更新後にmodifiedフラグをリセットして次のイベントを受け取る
@@ -197,7 +1336,7 @@ class JSONYAMLNotepad:
     
     def save_undo_state(self):
         """現在の状態をundo履歴に保存"""
-        current_content = self.text_area.get("1.0", tk.END+"-1c")
+        current_content = self.get_content()
         if current_content != self.last_content:
             self.text_area.edit_separator()
             self.last_content = current_content
@@ -231,10 +1370,14 @@ class JSONYAMLNotepad:
         def search():
             query = search_entry.get()
             if query:
-                start_pos = self.text_area.search(query, "1.0", tk.END)
+                if self.soft_chunked:
+                    start_pos, end_pos = self.search_true_content(query)
+                else:
+                    start_pos = self.text_area.search(query, "1.0", tk.END)
+                    if start_pos:
+                        line, char = map(int, start_pos.split('.'))
+                        end_pos = f"{line}.{char + len(query)}"
                 if start_pos:
-                    line, char = map(int, start_pos.split('.'))
-                    end_pos = f"{line}.{char + len(query)}"
                     self.text_area.tag_remove(tk.SEL, "1.0", tk.END)
                     self.text_area.tag_add(tk.SEL, start_pos, end_pos)
                     self.text_area.mark_set(tk.INSERT, start_pos)
@@ -265,10 +1408,9 @@ class JSONYAMLNotepad:
             query = search_entry.get()
             replacement = replace_entry.get()
             if query:
-                content = self.text_area.get("1.0", tk.END+"-1c")
+                content = self.get_content()
                 new_content = content.replace(query, replacement)
-                self.text_area.delete("1.0", tk.END)
-                self.text_area.insert(tk.END, new_content)
+                self.set_content(new_content)
                 self.status_bar.config(text=f"置換完了: {query} → {replacement}")
         
         tk.Button(replace_window, text="すべて置換", command=replace).grid(row=2, column=1, sticky=tk.E, padx=5, pady=5)
@@ -320,12 +1462,15 @@ class JSONYAMLNotepad:
 
         # 新規作成前に編集区切りを挿入
         self.text_area.edit_separator()
-        self.text_area.delete("1.0", tk.END)
+        self.set_content("")
         # 削除後に編集区切りを挿入
         self.text_area.edit_separator()
         self.last_content = ""
 
+        self.stop_follow()
+        self.set_follow_trimmed(False)
         self.current_file = None
+        self.set_file_encoding("utf-8", False, None)
         self.root.title("メモ帳 - JSON/YAML/XML コンバーター")
         self.text_area.edit_modified(False)
         self.unsaved_changes = False
@@ -347,22 +1492,27 @@ class JSONYAMLNotepad:
         
         if file_path:
             try:
-                with open(file_path, "r", encoding="utf-8") as file:
-                    content = file.read()
+                # 文字コードと改行コードを判定して読み込む
+                content, encoding, bom, newline = read_text_file(file_path)
+                # 長い行がある場合は整形して開くかどうかを確認
+                content, formatted = self.offer_pretty_print(content)
                 
                 # ファイルを開く前に編集区切りを挿入
                 self.text_area.edit_separator()
                 
-                self.text_area.delete("1.0", tk.END)
-                self.text_area.insert(tk.END, content)
+                self.set_content(content)
                 
                 # ファイルを開いた後に編集区切りを挿入
                 self.text_area.edit_separator()
                 self.last_content = content
                 self.text_area.edit_modified(False)
-                self.unsaved_changes = False
+                # 整形した場合はファイルの内容と異なるため未保存扱いにする
+                self.unsaved_changes = formatted
                 
+                self.stop_follow()
+                self.set_follow_trimmed(False)
                 self.current_file = file_path
+                self.set_file_encoding(encoding, bom, newline)
                 self.root.title(f"{file_path} - メモ帳")
                 self.status_bar.config(text=f"ファイルを開きました: {file_path}")
             except Exception as e:
@@ -386,33 +1536,38 @@ class JSONYAMLNotepad:
                     return
             
             try:
-                with open(file_path, "r", encoding="utf-8") as file:
-                    content = file.read()
+                # 文字コードと改行コードを判定して読み込む
+                content, encoding, bom, newline = read_text_file(file_path)
+                # 長い行がある場合は整形して開くかどうかを確認
+                content, formatted = self.offer_pretty_print(content)
                 
                 # ファイルを開く前に編集区切りを挿入
                 self.text_area.edit_separator()
                 
-                self.text_area.delete("1.0", tk.END)
-                self.text_area.insert(tk.END, content)
+                self.set_content(content)
                 
                 # ファイルを開いた後に編集区切りを挿入
                 self.text_area.edit_separator()
                 self.last_content = content
                 self.text_area.edit_modified(False)
-                self.unsaved_changes = False
+                # 整形した場合はファイルの内容と異なるため未保存扱いにする
+                self.unsaved_changes = formatted
 
+                self.stop_follow()
+                self.set_follow_trimmed(False)
                 self.current_file = file_path
+                self.set_file_encoding(encoding, bom, newline)
                 self.root.title(f"{file_path} - メモ帳")
                 self.status_bar.config(text=f"ファイルを開きました: {file_path}")
             except Exception as e:
                 messagebox.showerror("エラー", f"ファイルを開けませんでした: {str(e)}")
     
     def save_file(self):
-        if self.current_file:
+        if self.current_file and not self.follow_trimmed:
             try:
-                content = self.text_area.get("1.0", tk.END+"-1c")
-                with open(self.current_file, "w", encoding="utf-8") as file:
-                    file.write(content)
+                content = self.get_content()
+                if not self.write_file(self.current_file, content):
+                    return False
                 self.last_content = content
                 self.text_area.edit_modified(False)
                 self.unsaved_changes = False
@@ -422,8 +1577,42 @@ class JSONYAMLNotepad:
                 messagebox.showerror("エラー", f"保存できませんでした: {str(e)}")
                 return False
         else:
+            if self.current_file:
+                # 上書きするとファイルの先頭部分が失われるため、名前を付けて保存する
+                messagebox.showinfo("情報", "ファイルの末尾のみを表示しているため、上書きせずに名前を付けて保存します")
             return self.save_as()
     
+    def write_file(self, file_path, content):
+        """開いたときの文字コード・BOM・改行コードのままファイルに書き込む
+
+        先にすべてバイト列に変換してから開くため、変換に失敗してもファイルは空にならない。
+        その文字コードで保存できない文字がある場合はUTF-8で保存するかを確認し、
+        保存しなかった場合はFalseを返す。
+        """
+        newline = self.file_newline or os.linesep
+        if newline != "\n":
+            content = content.replace("\n", newline)
+        text = "\ufeff" + content if self.file_bom else content
+        try:
+            data = text.encode(self.file_encoding)
+        except UnicodeEncodeError as e:
+            label = encoding_label(self.file_encoding, self.file_bom, None)
+            if not messagebox.askyesno(
+                    "確認", f"{label} で保存できない文字が含まれています（{text[e.start:e.end]!r}）。UTF-8で保存しますか？"):
+                return False
+            self.set_file_encoding("utf-8", False, self.file_newline)
+            data = content.encode("utf-8")
+        with open(file_path, "wb") as file:
+            file.write(data)
+        return True
+    
+    def set_file_encoding(self, encoding, bom, newline):
+        """現在のファイルの文字コード・BOMの有無・改行コードを設定"""
+        self.file_encoding = encoding
+        self.file_bom = bom
+        self.file_newline = newline
+        self.encoding_status.config(text=encoding_label(encoding, bom, newline))
+    
     def save_as(self):
         file_path = filedialog.asksaveasfilename(
             defaultextension=".txt",
@@ -438,9 +1627,12 @@ class JSONYAMLNotepad:
         
         if file_path:
             try:
-                content = self.text_area.get("1.0", tk.END+"-1c")
-                with open(file_path, "w", encoding="utf-8") as file:
-                    file.write(content)
+                content = self.get_content()
+                if not self.write_file(file_path, content):
+                    return False
+                self.stop_follow()
+                # 保存したファイルは表示中の内容と一致するため一部のみの表示ではなくなる
+                self.set_follow_trimmed(False)
                 self.current_file = file_path
                 self.last_content = content
                 self.text_area.edit_modified(False)
@@ -453,6 +1645,151 @@ class JSONYAMLNotepad:
                 return False
         return False
     
+    def toggle_follow(self):
+        """追跡モードの切り替え"""
+        if not self.follow_var.get():
+            self.stop_follow()
+            self.status_bar.config(text="追跡を終了しました")
+            return
+        if not self.current_file:
+            self.follow_var.set(False)
+            messagebox.showinfo("情報", "追跡するファイルが開かれていません")
+            return
+        if self.unsaved_changes:
+            if not messagebox.askyesno("確認", "内容が保存されていません。ファイルを読み込み直して追跡してもよろしいですか？"):
+                self.follow_var.set(False)
+                return
+        try:
+            self.follow_reload()
+        except (OSError, UnicodeDecodeError) as e:
+            self.follow_var.set(False)
+            messagebox.showerror("エラー", f"ファイルを開けませんでした: {str(e)}")
+            return
+        self.status_bar.config(text=f"追跡中: {self.current_file}")
+        self.follow_job = self.root.after(FOLLOW_INTERVAL_MS, self.poll_follow)
+    
+    def stop_follow(self):
+        """追跡モードを終了"""
+        if self.follow_job is not None:
+            self.root.after_cancel(self.follow_job)
+            self.follow_job = None
+        self.follow_var.set(False)
+        self.follow_decoder = None
+    
+    def follow_reload(self):
+        """追跡中のファイルを読み込み直す（保持する行数が決まっていれば末尾だけ読む）"""
+        max_lines = self.follow_max_lines.get()
+        with open(self.current_file, "rb") as file:
+            size = os.fstat(file.fileno()).st_size
+            head = file.read(ENCODING_PROBE_SIZE)
+            start = 0
+            if max_lines and size > len(head):
+                start = find_tail_start(file, size, head, max_lines)
+            if start:
+                file.seek(start)
+                data = file.read()
+            else:
+                data = head + file.read()
+            # 読み込み中に追記された場合に備え、読み込んだ後のサイズと更新日時を記録する
+            stat = os.fstat(file.fileno())
+        # デコーダーは改行コードの変換と、読み込み途中で切れたマルチバイト文字の持ち越しを行う
+        content, encoding, bom, newline, self.follow_decoder = decode_file_data(
+            data, final=False, head=head if start else None)
+        self.set_file_encoding(encoding, bom, newline)
+        self.follow_offset = start + len(data)
+        self.follow_stat = stat
+        self.follow_head = head[:FOLLOW_HEAD_SIZE]
+        del data
+        # 先頭を読み飛ばした場合はファイルの一部のみを表示している
+        self.set_follow_trimmed(start > 0)
+        
+        self.set_content(content, keep_history=False)
+        del content
+        self.trim_follow_lines()
+        self.text_area.see(tk.END)
+        # 追跡中は内容が変わり続けるため、読み込んだ内容は保持しない
+        self.last_content = ""
+        self.text_area.edit_modified(False)
+        self.unsaved_changes = False
+        self.char_count.config(text=f"文字数: {self.content_length()}")
+    
+    def poll_follow(self):
+        """ファイルのサイズと更新日時を確認し、追記された分だけ読み込む"""
+        self.follow_job = None
+        try:
+            stat = os.stat(self.current_file)
+        except OSError:
+            # ローテーション中などでファイルが一時的に存在しない場合は次回に再確認
+            self.follow_job = self.root.after(FOLLOW_INTERVAL_MS, self.poll_follow)
+            return
+        
+        previous = self.follow_stat
+        delay = FOLLOW_INTERVAL_MS
+        try:
+            if ((stat.st_ino, stat.st_dev) != (previous.st_ino, previous.st_dev)
+                    or stat.st_size < self.follow_offset
+                    or (stat.st_size == self.follow_offset and stat.st_mtime_ns != previous.st_mtime_ns)):
+                # 別のファイルへの置き換え・切り詰め・同じサイズでの書き換えは読み込み直す
+                self.follow_reload()
+                self.status_bar.config(text=f"ファイルが置き換えられたため再読み込みしました: {self.current_file}")
+            elif stat.st_size > self.follow_offset:
+                if not self.follow_append():
+                    # 先頭の内容が変わっている場合は別のファイルに置き換えられている
+                    self.follow_reload()
+                    self.status_bar.config(text=f"ファイルが置き換えられたため再読み込みしました: {self.current_file}")
+                elif self.follow_offset < stat.st_size:
+                    # 読み残しがある場合はすぐに続きを読む
+                    delay = 1
+        except (OSError, UnicodeDecodeError) as e:
+            self.stop_follow()
+            messagebox.showerror("エラー", f"ファイルを読み込めませんでした: {str(e)}")
+            return
+        self.follow_job = self.root.after(delay, self.poll_follow)
+    
+    def follow_append(self):
+        """前回読み込んだ位置以降に追記されたバイト列だけを読み込んで末尾に追加
+
+        ファイルの先頭が前回と異なる場合は何もせずにFalseを返す。
+        """
+        with open(self.current_file, "rb") as file:
+            if file.read(len(self.follow_head)) != self.follow_head:
+                return False
+            file.seek(self.follow_offset)
+            data = file.read(FOLLOW_READ_LIMIT)
+            self.follow_stat = os.fstat(file.fileno())
+        self.follow_offset += len(data)
+        text = self.follow_decoder.decode(data)
+        if not text:
+            return True
+        
+        # 末尾を表示している場合のみ自動でスクロールする
+        at_bottom = self.text_area.yview()[1] >= 1.0
+        self.append_content(text)
+        self.trim_follow_lines()
+        if at_bottom:
+            self.text_area.see(tk.END)
+        # 追記された内容は未保存の変更として扱わない
+        self.text_area.edit_modified(False)
+        self.char_count.config(text=f"文字数: {self.content_length()}")
+        return True
+    
+    def trim_follow_lines(self):
+        """保持する行数を超えた古い行を削除"""
+        max_lines = self.follow_max_lines.get()
+        if not max_lines:
+            return
+        last_line, column = map(int, self.text_area.index(tk.END+"-1c").split("."))
+        # 末尾が改行で終わっている場合は最後の空行を数えない
+        lines = last_line if column else last_line - 1
+        if self.soft_chunked:
+            # 表示上の分割用の改行を除いたファイル上の行数で数える
+            lines -= len(self.text_area.tag_ranges(SOFT_BREAK_TAG)) // 2
+        if lines > max_lines:
+            self.text_area.delete("1.0", self.display_index(lines - max_lines + 1, 0))
+            # 元に戻す履歴に削除した行が残らないようにする
+            self.text_area.edit_reset()
+            self.set_follow_trimmed(True)
+    
     def exit_app(self):
         if self.unsaved_changes:
             result = messagebox.askyesnocancel(
@@ -472,9 +1809,84 @@ class JSONYAMLNotepad:
         self.text_area.see(tk.INSERT)
         return "break"
     
+    def conversion_guard(self):
+        """現在の制限設定で変換1回分のConversionGuardを作成"""
+        return ConversionGuard(**self.conversion_limits)
+    
+    def load_json(self, content, guard):
+        """JSONを読み込む（省メモリモードではキーと文字列を共有する）"""
+        return load_json_guarded(content, guard, self.compact_mode.get())
+    
+    def load_yaml(self, content, guard):
+        """YAMLを読み込む（省メモリモードではキーと文字列を共有する）"""
+        data = load_yaml_guarded(content, guard)
+        return compact_data(data) if self.compact_mode.get() else data
+    
+    def load_xml(self, content, guard):
+        """XMLを読み込む（省メモリモードではキーと文字列を共有する）"""
+        data = load_xml_guarded(content, guard)
+        return compact_data(data) if self.compact_mode.get() else data
+    
+    def dump_json(self, data, guard):
+        """インデント付きのJSONに変換（RecordTableもそのまま出力できる）"""
+        return dump_json_guarded(data, guard, self.compact_mode.get())
+    
+    def dump_yaml(self, data, guard, **kwargs):
+        """YAMLに変換"""
+        return dump_yaml_guarded(data, guard, **kwargs)
+    
+    def dump_xml(self, data, guard):
+        """XMLに変換"""
+        return dump_xml_guarded(data, guard)
+    
+    def on_limit_exceeded(self, error):
+        """変換時の制限を超えたときに変換を中止したことを表示"""
+        if isinstance(error, RecursionError):
+            message = "ネストが深すぎるため変換を中止しました"
+        else:
+            message = f"変換を中止しました: {error}"
+        self.status_bar.config(text=message)
+        messagebox.showwarning("変換の制限", message)
+    
+    def edit_conversion_limits(self):
+        # 変換時の制限を設定するダイアログを表示
+        limits_window = tk.Toplevel(self.root)
+        limits_window.title("変換の制限")
+        limits_window.geometry("360x180")
+        limits_window.transient(self.root)
+        limits_window.resizable(False, False)
+        
+        labels = {
+            "max_alias_expansions": "YAMLエイリアスの展開数:",
+            "max_depth": "ネストの深さ:",
+            "max_output_size": "出力の文字数:",
+            "timeout": "処理時間（秒）:",
+        }
+        entries = {}
+        for row, (name, label) in enumerate(labels.items()):
+            tk.Label(limits_window, text=label).grid(row=row, column=0, sticky=tk.W, padx=5, pady=5)
+            entry = tk.Entry(limits_window, width=20)
+            entry.insert(0, str(self.conversion_limits[name]))
+            entry.grid(row=row, column=1, padx=5, pady=5)
+            entries[name] = entry
+        
+        def apply_limits():
+            try:
+                limits = {name: int(entry.get()) for name, entry in entries.items()}
+            except ValueError:
+                messagebox.showerror("エラー", "制限には整数を入力してください", parent=limits_window)
+                return
+            if min(limits.values()) <= 0:
+                messagebox.showerror("エラー", "制限には正の整数を入力してください", parent=limits_window)
+                return
+            self.conversion_limits = limits
+            limits_window.destroy()
+        
+        tk.Button(limits_window, text="適用", command=apply_limits).grid(row=len(labels), column=1, sticky=tk.E, padx=5, pady=5)
+    
     # XML変換メソッドを追加
     def json_to_xml(self):
-        content = self.text_area.get("1.0", tk.END+"-1c")
+        content = self.get_content()
         if not content.strip():
             messagebox.showinfo("情報", "変換するテキストがありません")
             return
@@ -484,14 +1896,12 @@ class JSONYAMLNotepad:
             self.text_area.edit_separator()
             
             # JSONをパース
-            json_data = json.loads(content)
+            guard = self.conversion_guard()
+            json_data = self.load_json(content, guard)
             # XMLに変換
-            xml_data = dicttoxml.dicttoxml(json_data, custom_root='root', attr_type=False)
-            # バイト列を文字列に変換
-            xml_str = xml_data.decode('utf-8')
+            xml_str = self.dump_xml(json_data, guard)
             # テキストエリアを更新
-            self.text_area.delete("1.0", tk.END)
-            self.text_area.insert(tk.END, xml_str)
+            self.set_content(xml_str)
             
             # 変換後に編集区切りを挿入
             self.text_area.edit_separator()
@@ -500,11 +1910,13 @@ class JSONYAMLNotepad:
             self.status_bar.config(text="JSONからXMLに変換しました")
         except json.JSONDecodeError as e:
             messagebox.showerror("エラー", f"JSONの解析に失敗しました: {str(e)}")
+        except (ConversionLimitError, RecursionError) as e:
+            self.on_limit_exceeded(e)
         except Exception as e:
             messagebox.showerror("エラー", f"変換中にエラーが発生しました: {str(e)}")
     
     def xml_to_json(self):
-        content = self.text_area.get("1.0", tk.END+"-1c")
+        content = self.get_content()
         if not content.strip():
             messagebox.showinfo("情報", "変換するテキストがありません")
             return
@@ -514,23 +1926,25 @@ class JSONYAMLNotepad:
             self.text_area.edit_separator()
             
             # XMLをパース
-            xml_dict = xmltodict.parse(content)
+            guard = self.conversion_guard()
+            xml_dict = self.load_xml(content, guard)
             # JSONに変換 (インデント付き)
-            json_data = json.dumps(xml_dict, ensure_ascii=False, indent=2)
+            json_data = self.dump_json(xml_dict, guard)
             # テキストエリアを更新
-            self.text_area.delete("1.0", tk.END)
-            self.text_area.insert(tk.END, json_data)
+            self.set_content(json_data)
             
             # 変換後に編集区切りを挿入
             self.text_area.edit_separator()
             self.last_content = json_data
             
             self.status_bar.config(text="XMLからJSONに変換しました")
+        except (ConversionLimitError, RecursionError) as e:
+            self.on_limit_exceeded(e)
         except Exception as e:
             messagebox.showerror("エラー", f"変換中にエラーが発生しました: {str(e)}")
     
     def yaml_to_xml(self):
-        content = self.text_area.get("1.0", tk.END+"-1c")
+        content = self.get_content()
         if not content.strip():
             messagebox.showinfo("情報", "変換するテキストがありません")
             return
@@ -540,14 +1954,12 @@ class JSONYAMLNotepad:
             self.text_area.edit_separator()
             
             # YAMLをパース
-            yaml_data = yaml.safe_load(content)
+            guard = self.conversion_guard()
+            yaml_data = self.load_yaml(content, guard)
             # XMLに変換
-            xml_data = dicttoxml.dicttoxml(yaml_data, custom_root='root', attr_type=False)
-            # バイト列を文字列に変換
-            xml_str = xml_data.decode('utf-8')
+            xml_str = self.dump_xml(yaml_data, guard)
             # テキストエリアを更新
-            self.text_area.delete("1.0", tk.END)
-            self.text_area.insert(tk.END, xml_str)
+            self.set_content(xml_str)
             
             # 変換後に編集区切りを挿入
             self.text_area.edit_separator()
@@ -556,11 +1968,13 @@ class JSONYAMLNotepad:
             self.status_bar.config(text="YAMLからXMLに変換しました")
         except yaml.YAMLError as e:
             messagebox.showerror("エラー", f"YAMLの解析に失敗しました: {str(e)}")
+        except (ConversionLimitError, RecursionError) as e:
+            self.on_limit_exceeded(e)
         except Exception as e:
             messagebox.showerror("エラー", f"変換中にエラーが発生しました: {str(e)}")
     
     def xml_to_yaml(self):
-        content = self.text_area.get("1.0", tk.END+"-1c")
+        content = self.get_content()
         if not content.strip():
             messagebox.showinfo("情報", "変換するテキストがありません")
             return
@@ -570,23 +1984,25 @@ class JSONYAMLNotepad:
             self.text_area.edit_separator()
             
             # XMLをパース
-            xml_dict = xmltodict.parse(content)
+            guard = self.conversion_guard()
+            xml_dict = self.load_xml(content, guard)
             # YAMLに変換
-            yaml_data = yaml.dump(xml_dict, allow_unicode=True, sort_keys=False, default_flow_style=False)
+            yaml_data = self.dump_yaml(xml_dict, guard, default_flow_style=False)
             # テキストエリアを更新
-            self.text_area.delete("1.0", tk.END)
-            self.text_area.insert(tk.END, yaml_data)
+            self.set_content(yaml_data)
             
             # 変換後に編集区切りを挿入
             self.text_area.edit_separator()
             self.last_content = yaml_data
             
             self.status_bar.config(text="XMLからYAMLに変換しました")
+        except (ConversionLimitError, RecursionError) as e:
+            self.on_limit_exceeded(e)
         except Exception as e:
             messagebox.showerror("エラー", f"変換中にエラーが発生しました: {str(e)}")
     
     def format_xml(self):
-        content = self.text_area.get("1.0", tk.END+"-1c")
+        content = self.get_content()
         if not content.strip():
             messagebox.showinfo("情報", "整形するテキストがありません")
             return
@@ -600,19 +2016,20 @@ class JSONYAMLNotepad:
             # 整形して出力
             formatted_xml = dom.toprettyxml(indent="  ")
             # テキストエリアを更新
-            self.text_area.delete("1.0", tk.END)
-            self.text_area.insert(tk.END, formatted_xml)
+            self.set_content(formatted_xml)
             
             # 変換後に編集区切りを挿入
             self.text_area.edit_separator()
             self.last_content = formatted_xml
             
             self.status_bar.config(text="XMLを整形しました")
+        except (ConversionLimitError, RecursionError) as e:
+            self.on_limit_exceeded(e)
         except Exception as e:
             messagebox.showerror("エラー", f"整形中にエラーが発生しました: {str(e)}")
     
     def json_to_yaml(self):
-        content = self.text_area.get("1.0", tk.END+"-1c")
+        content = self.get_content()
         if not content.strip():
             messagebox.showinfo("情報", "変換するテキストがありません")
             return
@@ -622,12 +2039,12 @@ class JSONYAMLNotepad:
             self.text_area.edit_separator()
             
             # JSONをパース
-            json_data = json.loads(content)
+            guard = self.conversion_guard()
+            json_data = self.load_json(content, guard)
             # YAMLに変換
-            yaml_data = yaml.dump(json_data, allow_unicode=True, sort_keys=False)
+            yaml_data = self.dump_yaml(json_data, guard)
             # テキストエリアを更新
-            self.text_area.delete("1.0", tk.END)
-            self.text_area.insert(tk.END, yaml_data)
+            self.set_content(yaml_data)
             
             # 変換後に編集区切りを挿入
             self.text_area.edit_separator()
@@ -636,11 +2053,13 @@ class JSONYAMLNotepad:
             self.status_bar.config(text="JSONからYAMLに変換しました")
         except json.JSONDecodeError as e:
             messagebox.showerror("エラー", f"JSONの解析に失敗しました: {str(e)}")
+        except (ConversionLimitError, RecursionError) as e:
+            self.on_limit_exceeded(e)
         except Exception as e:
             messagebox.showerror("エラー", f"変換中にエラーが発生しました: {str(e)}")
     
     def yaml_to_json(self):
-        content = self.text_area.get("1.0", tk.END+"-1c")
+        content = self.get_content()
         if not content.strip():
             messagebox.showinfo("情報", "変換するテキストがありません")
             return
@@ -650,12 +2069,12 @@ class JSONYAMLNotepad:
             self.text_area.edit_separator()
             
             # YAMLをパース
-            yaml_data = yaml.safe_load(content)
+            guard = self.conversion_guard()
+            yaml_data = self.load_yaml(content, guard)
             # JSONに変換 (インデント付き)
-            json_data = json.dumps(yaml_data, ensure_ascii=False, indent=2)
+            json_data = self.dump_json(yaml_data, guard)
             # テキストエリアを更新
-            self.text_area.delete("1.0", tk.END)
-            self.text_area.insert(tk.END, json_data)
+            self.set_content(json_data)
             
             # 変換後に編集区切りを挿入
             self.text_area.edit_separator()
@@ -664,11 +2083,151 @@ class JSONYAMLNotepad:
             self.status_bar.config(text="YAMLからJSONに変換しました")
         except yaml.YAMLError as e:
             messagebox.showerror("エラー", f"YAMLの解析に失敗しました: {str(e)}")
+        except (ConversionLimitError, RecursionError) as e:
+            self.on_limit_exceeded(e)
+        except Exception as e:
+            messagebox.showerror("エラー", f"変換中にエラーが発生しました: {str(e)}")
+    
+    def json_to_jsonl(self):
+        content = self.get_content()
+        if not content.strip():
+            messagebox.showinfo("情報", "変換するテキストがありません")
+            return
+        
+        try:
+            # 変換前に編集区切りを挿入
+            self.text_area.edit_separator()
+            
+            # JSONをレコード単位でJSON Linesに変換
+            guard = self.conversion_guard()
+            jsonl_data = guard.join(records_to_json_lines(
+                iter_json_records(content, lambda text: self.load_json(text, guard))))
+            # テキストエリアを更新
+            self.set_content(jsonl_data)
+            
+            # 変換後に編集区切りを挿入
+            self.text_area.edit_separator()
+            self.last_content = jsonl_data
+            
+            self.status_bar.config(text="JSONからJSON Linesに変換しました")
+        except json.JSONDecodeError as e:
+            messagebox.showerror("エラー", f"JSONの解析に失敗しました: {str(e)}")
+        except (ConversionLimitError, RecursionError) as e:
+            self.on_limit_exceeded(e)
+        except Exception as e:
+            messagebox.showerror("エラー", f"変換中にエラーが発生しました: {str(e)}")
+    
+    def jsonl_to_json(self):
+        content = self.get_content()
+        if not content.strip():
+            messagebox.showinfo("情報", "変換するテキストがありません")
+            return
+        
+        try:
+            # 変換前に編集区切りを挿入
+            self.text_area.edit_separator()
+            
+            # JSON Linesをレコード単位でJSON配列に変換 (インデント付き)
+            guard = self.conversion_guard()
+            json_data = guard.join(records_to_json_array(
+                iter_json_records(content, lambda text: self.load_json(text, guard))))
+            # テキストエリアを更新
+            self.set_content(json_data)
+            
+            # 変換後に編集区切りを挿入
+            self.text_area.edit_separator()
+            self.last_content = json_data
+            
+            self.status_bar.config(text="JSON LinesからJSONに変換しました")
+        except json.JSONDecodeError as e:
+            messagebox.showerror("エラー", f"JSONの解析に失敗しました: {str(e)}")
+        except (ConversionLimitError, RecursionError) as e:
+            self.on_limit_exceeded(e)
+        except Exception as e:
+            messagebox.showerror("エラー", f"変換中にエラーが発生しました: {str(e)}")
+    
+    def json_to_csv(self):
+        self.json_to_delimited(",", "CSV")
+    
+    def json_to_tsv(self):
+        self.json_to_delimited("\t", "TSV")
+    
+    def csv_to_json(self):
+        self.delimited_to_json(",", "CSV")
+    
+    def tsv_to_json(self):
+        self.delimited_to_json("\t", "TSV")
+    
+    def json_to_delimited(self, delimiter, label):
+        """JSON配列またはJSON LinesをCSV/TSVに変換"""
+        content = self.get_content()
+        if not content.strip():
+            messagebox.showinfo("情報", "変換するテキストがありません")
+            return
+        
+        try:
+            # 変換前に編集区切りを挿入
+            self.text_area.edit_separator()
+            
+            # レコード単位でCSV/TSVに変換（列は先頭のレコードから推定）
+            guard = self.conversion_guard()
+            dropped_columns = set()
+            delimited_data = guard.join(records_to_delimited(
+                iter_json_records(content, lambda text: self.load_json(text, guard)), delimiter,
+                nested=self.nested_mode.get(), sep=self.flatten_separator.get(),
+                dropped_columns=dropped_columns))
+            # テキストエリアを更新
+            self.set_content(delimited_data)
+            
+            # 変換後に編集区切りを挿入
+            self.text_area.edit_separator()
+            self.last_content = delimited_data
+            
+            status = f"JSONから{label}に変換しました"
+            if dropped_columns:
+                status += f"（先頭{CSV_SAMPLE_SIZE}件にない列を除外: {', '.join(sorted(dropped_columns))}）"
+            self.status_bar.config(text=status)
+        except json.JSONDecodeError as e:
+            messagebox.showerror("エラー", f"JSONの解析に失敗しました: {str(e)}")
+        except (ConversionLimitError, RecursionError) as e:
+            self.on_limit_exceeded(e)
+        except Exception as e:
+            messagebox.showerror("エラー", f"変換中にエラーが発生しました: {str(e)}")
+    
+    def delimited_to_json(self, delimiter, label):
+        """CSV/TSVをJSON配列に変換"""
+        content = self.get_content()
+        if not content.strip():
+            messagebox.showinfo("情報", "変換するテキストがありません")
+            return
+        
+        try:
+            # 変換前に編集区切りを挿入
+            self.text_area.edit_separator()
+            
+            # CSV/TSVをレコード単位でJSON配列に変換 (インデント付き)
+            guard = self.conversion_guard()
+            json_data = guard.join(records_to_json_array(iter_delimited_records(
+                content, delimiter,
+                nested=self.nested_mode.get(), sep=self.flatten_separator.get(),
+                typed=self.typed_cells.get())))
+            # テキストエリアを更新
+            self.set_content(json_data)
+            
+            # 変換後に編集区切りを挿入
+            self.text_area.edit_separator()
+            self.last_content = json_data
+            
+            self.status_bar.config(text=f"{label}からJSONに変換しました")
+        except csv.Error as e:
+            messagebox.showerror("エラー", f"{label}の解析に失敗しました: {str(e)}")
+        except (ConversionLimitError, RecursionError) as e:
+            self.on_limit_exceeded(e)
         except Exception as e:
             messagebox.showerror("エラー", f"変換中にエラーが発生しました: {str(e)}")
     
     def format_json(self):
-        content = self.text_area.get("1.0", tk.END+"-1c")
+        content = self.get_content()
         if not content.strip():
             messagebox.showinfo("情報", "整形するテキストがありません")
             return
@@ -678,12 +2237,12 @@ class JSONYAMLNotepad:
             self.text_area.edit_separator()
             
             # JSONをパース
-            json_data = json.loads(content)
+            guard = self.conversion_guard()
+            json_data = self.load_json(content, guard)
             # 整形して出力 (インデント付き)
-            formatted_json = json.dumps(json_data, ensure_ascii=False, indent=2)
+            formatted_json = self.dump_json(json_data, guard)
             # テキストエリアを更新
-            self.text_area.delete("1.0", tk.END)
-            self.text_area.insert(tk.END, formatted_json)
+            self.set_content(formatted_json)
             
             # 変換後に編集区切りを挿入
             self.text_area.edit_separator()
@@ -692,11 +2251,13 @@ class JSONYAMLNotepad:
             self.status_bar.config(text="JSONを整形しました")
         except json.JSONDecodeError as e:
             messagebox.showerror("エラー", f"JSONの解析に失敗しました: {str(e)}")
+        except (ConversionLimitError, RecursionError) as e:
+            self.on_limit_exceeded(e)
         except Exception as e:
             messagebox.showerror("エラー", f"整形中にエラーが発生しました: {str(e)}")
     
     def format_yaml(self):
-        content = self.text_area.get("1.0", tk.END+"-1c")
+        content = self.get_content()
         if not content.strip():
             messagebox.showinfo("情報", "整形するテキストがありません")
             return
@@ -706,12 +2267,12 @@ class JSONYAMLNotepad:
             self.text_area.edit_separator()
             
             # YAMLをパース
-            yaml_data = yaml.safe_load(content)
+            guard = self.conversion_guard()
+            yaml_data = self.load_yaml(content, guard)
             # 整形して出力
-            formatted_yaml = yaml.dump(yaml_data, allow_unicode=True, sort_keys=False, default_flow_style=False)
+            formatted_yaml = self.dump_yaml(yaml_data, guard, default_flow_style=False)
             # テキストエリアを更新
-            self.text_area.delete("1.0", tk.END)
-            self.text_area.insert(tk.END, formatted_yaml)
+            self.set_content(formatted_yaml)
             
             # 変換後に編集区切りを挿入
             self.text_area.edit_separator()
@@ -720,6 +2281,8 @@ class JSONYAMLNotepad:
             self.status_bar.config(text="YAMLを整形しました")
         except yaml.YAMLError as e:
             messagebox.showerror("エラー", f"YAMLの解析に失敗しました: {str(e)}")
+        except (ConversionLimitError, RecursionError) as e:
+            self.on_limit_exceeded(e)
         except Exception as e:
             messagebox.showerror("エラー", f"整形中にエラーが発生しました: {str(e)}")
     
@@ -742,6 +2305,43 @@ JSON/YAML/XMLコンバーターの使い方:
 - F12: XML → YAML
 - Ctrl+F12: XMLフォーマット整形
 
+レコード配列の変換:
+- 変換メニューからJSON Lines、CSV、TSVとの相互変換ができます。
+- JSONからの変換ではJSON配列とJSON Linesのどちらも入力にできます。
+- CSV/TSVの列は先頭1000件のレコードから推定します。
+- ネストしたフィールドの扱いは「CSV/TSVのネスト設定」で選べます。
+- CSV/TSVからJSONへの変換では、{ や [ で始まるJSONのオブジェクト・配列の
+  セルは元に戻し、それ以外の値は通常すべて文字列になります。
+  「値の型を復元」をオンにすると数値・true・false・nullも復元しますが、
+  元が文字列だった "1" なども数値になり、空のセルはnullになります。
+
+長い行の表示:
+- 非常に長い行を含むファイルを開くと、整形してから表示するかを確認します。
+- 整形しない場合や変換結果に長い行がある場合は、表示上だけ行を分割します。
+  保存される内容は変わらず、ステータスバーの行・列はファイル上の位置を示します。
+- 分割表示中は元に戻す・やり直しは使えません。
+
+末尾の追跡:
+- ファイルメニューの「末尾を追跡」をオンにすると、開いているファイルに
+  追記された内容を自動で読み込みます（ログファイルの監視などに使えます）。
+- ファイルが切り詰められたり置き換えられたりした場合は読み込み直します。
+- 「追跡時に保持する行数」を設定すると、古い行を削除して末尾だけを表示します。
+  この状態で保存すると、元のファイルを上書きせずに名前を付けて保存します。
+
+変換の制限:
+- YAMLのエイリアスの展開数、ネストの深さ、出力の文字数、処理時間に
+  制限があり、超えた場合は変換を中止します（テキストは変更されません）。
+- 制限は変換メニューの「変換の制限設定」で変更できます。
+
+省メモリモード:
+- 変換メニューの「省メモリモードで読み込む」をオンにすると、大きなデータを
+  変換するときのメモリ使用量を抑えられます（処理時間は少し長くなります）。
+
+文字コード:
+- ファイルを開くときにBOMやXML宣言などから文字コードを判定します
+  （UTF-8、UTF-16、UTF-32、Shift_JISなど）。
+- 保存するときは開いたときの文字コード・BOM・改行コードを保ちます。
+
 その他の機能:
 - ファイルをウィンドウにドラッグ＆ドロップしてファイルを開くことができます。
 - 一般的なメモ帳としても使用できます。ファイルの新規作成、
@@ -751,29 +2351,52 @@ JSON/YAML/XMLコンバーターの使い方:
     
     def undo(self):
         """元に戻す機能"""
-        try:
-            # まず現在の編集状態を確定
-            self.text_area.edit_separator()
-            # 元に戻す操作を実行
-            self.text_area.edit_undo()
-            # 操作後の内容を記録
-            self.last_content = self.text_area.get("1.0", tk.END+"-1c")
-        except tk.TclError:
-            # 元に戻せない場合は何もしない
-            self.status_bar.config(text="これ以上元に戻せません")
+        if not self.soft_chunked:
+            try:
+                # まず現在の編集状態を確定
+                self.text_area.edit_separator()
+                # 元に戻す操作を実行
+                self.text_area.edit_undo()
+                # 操作後の内容を記録
+                self.last_content = self.get_content()
+                return
+            except tk.TclError:
+                pass
+        # Tkの履歴をたどれない場合は、履歴を消したときに記録した内容に戻す
+        if not self.undo_stack:
+            if self.soft_chunked:
+                self.status_bar.config(text="長い行を分割表示している間は元に戻せません")
+            else:
+                self.status_bar.config(text="これ以上元に戻せません")
+            return
+        before, _ = self.undo_stack.pop()
+        current = self.get_content()
+        self.redo_stack.append((before, current))
+        self.restore_snapshot(before)
     
     def redo(self):
         """やり直し機能"""
-        try:
-            # まず現在の編集状態を確定
-            self.text_area.edit_separator()
-            # やり直し操作を実行
-            self.text_area.edit_redo()
-            # 操作後の内容を記録
-            self.last_content = self.text_area.get("1.0", tk.END+"-1c")
-        except tk.TclError:
-            # やり直しできない場合は何もしない
-            self.status_bar.config(text="これ以上やり直せません")
+        if not self.soft_chunked:
+            try:
+                # まず現在の編集状態を確定
+                self.text_area.edit_separator()
+                # やり直し操作を実行
+                self.text_area.edit_redo()
+                # 操作後の内容を記録
+                self.last_content = self.get_content()
+                return
+            except tk.TclError:
+                pass
+        # 元に戻した後に編集していなければ、記録した内容をやり直す
+        if not self.redo_stack or self.redo_stack[-1][0] != self.get_content():
+            if self.soft_chunked:
+                self.status_bar.config(text="長い行を分割表示している間はやり直せません")
+            else:
+                self.status_bar.config(text="これ以上やり直せません")
+            return
+        before, after = self.redo_stack.pop()
+        self.undo_stack.append((before, after))
+        self.restore_snapshot(after)
     
     def show_about(self):
         messagebox.showinfo("このアプリについて", "JSON/YAML/XML メモ帳 コンバーター\nバージョン 3.0\n\nJSON、YAML、XMLを簡単に相互変換できるテキストエディタです。\nメモ帳としての機能も備えています。\nドラッグ＆ドロップでファイルを開くことができます。")
@@ -0,0 +1,140 @@
+"""変換処理のベンチマーク
+
+レコード配列を生成して各変換の処理時間とメモリ使用量のピークを計測する。
+通常の読み込みと省メモリモードの読み込み、変換時の制限の有無を比較できる。
+制限ありの変換はアプリと同じ関数を使う。制限に引っかかる入力は tests/test_conversion_limits.py で確認する。
+
+    python benchmark.py --records 20000
+"""
+import argparse
+import json
+import time
+import tracemalloc
+
+import dicttoxml
+import xmltodict
+import yaml
+
+from app import (DEFAULT_CONVERSION_LIMITS, ConversionGuard, compact_data, dump_json_guarded,
+                 dump_yaml_guarded, iter_json_chunks, load_json_compact, load_json_guarded,
+                 load_xml_guarded, load_yaml_guarded)
+
+
+def make_records(count):
+    """ベンチマーク用のレコード配列を生成する"""
+    statuses = ["active", "inactive", "pending"]
+    return [
+        {
+            "id": i,
+            "name": f"user{i}",
+            "status": statuses[i % len(statuses)],
+            "score": i * 0.5,
+            "address": {"city": "Tokyo", "zip": f"{100 + i % 900:03d}-0001"},
+        }
+        for i in range(count)
+    ]
+
+
+def new_guard():
+    return ConversionGuard(**DEFAULT_CONVERSION_LIMITS)
+
+
+def dump_json_plain(data, compact):
+    """制限なしでインデント付きのJSONに変換する（比較用）"""
+    if compact:
+        return "".join(iter_json_chunks(data, 2))
+    return json.dumps(data, ensure_ascii=False, indent=2)
+
+
+def json_to_json(content, compact, guard=None):
+    if guard:
+        return dump_json_guarded(load_json_guarded(content, guard, compact), guard, compact)
+    data = load_json_compact(content) if compact else json.loads(content)
+    return dump_json_plain(data, compact)
+
+
+def json_to_yaml(content, compact, guard=None):
+    if guard:
+        return dump_yaml_guarded(load_json_guarded(content, guard, compact), guard)
+    data = load_json_compact(content) if compact else json.loads(content)
+    return yaml.dump(data, allow_unicode=True, sort_keys=False)
+
+
+def yaml_to_json(content, compact, guard=None):
+    data = load_yaml_guarded(content, guard) if guard else yaml.safe_load(content)
+    data = compact_data(data) if compact else data
+    return dump_json_guarded(data, guard, compact) if guard else dump_json_plain(data, compact)
+
+
+def xml_to_json(content, compact, guard=None):
+    data = load_xml_guarded(content, guard) if guard else xmltodict.parse(content)
+    data = compact_data(data) if compact else data
+    return dump_json_guarded(data, guard, compact) if guard else dump_json_plain(data, compact)
+
+
+def measure(func, content, compact):
+    """処理時間とtracemallocで計測したメモリのピークを返す"""
+    start = time.perf_counter()
+    func(content, compact)
+    elapsed = time.perf_counter() - start
+
+    tracemalloc.start()
+    func(content, compact)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed, peak
+
+
+def best_times(func, content, repeat=5):
+    """制限なし・ありで変換したときのそれぞれの最短の処理時間を返す
+
+    負荷の変動の影響が偏らないように、制限なしと制限ありを交互に実行する。
+    """
+    plain = []
+    guarded = []
+    for _ in range(repeat):
+        for guard, times in ((None, plain), (new_guard(), guarded)):
+            start = time.perf_counter()
+            func(content, False, guard)
+            times.append(time.perf_counter() - start)
+    return min(plain), min(guarded)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="変換処理のベンチマーク")
+    parser.add_argument("--records", type=int, default=20000, help="生成するレコード数")
+    args = parser.parse_args()
+
+    records = make_records(args.records)
+    json_content = json.dumps(records, ensure_ascii=False)
+    yaml_content = yaml.dump(records, allow_unicode=True, sort_keys=False)
+    xml_content = dicttoxml.dicttoxml(records, custom_root="root", attr_type=False).decode("utf-8")
+    del records
+
+    cases = [
+        ("JSON → JSON", json_to_json, json_content),
+        ("JSON → YAML", json_to_yaml, json_content),
+        ("XML → JSON", xml_to_json, xml_content),
+    ]
+    print(f"レコード数: {args.records}")
+    print()
+    print("メモリ使用量")
+    print(f"{'変換':<14}{'モード':<8}{'入力(MB)':>10}{'時間(s)':>10}{'ピーク(MB)':>12}{'倍率':>8}")
+    for label, func, content in cases:
+        size = len(content.encode("utf-8"))
+        for compact in (False, True):
+            elapsed, peak = measure(func, content, compact)
+            mode = "省メモリ" if compact else "通常"
+            print(f"{label:<14}{mode:<8}{size / 2**20:>10.1f}{elapsed:>10.2f}"
+                  f"{peak / 2**20:>12.1f}{peak / size:>8.1f}")
+
+    print()
+    print("変換時の制限のオーバーヘッド")
+    print(f"{'変換':<14}{'制限なし(s)':>12}{'制限あり(s)':>12}{'増加率':>8}")
+    for label, func, content in cases + [("YAML → JSON", yaml_to_json, yaml_content)]:
+        plain, guarded = best_times(func, content)
+        print(f"{label:<14}{plain:>12.2f}{guarded:>12.2f}{(guarded / plain - 1) * 100:>7.1f}%")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+"""変換時の制限（ConversionGuard）のテスト
+
+アプリの変換と同じ読み込み・出力の関数に、制限に引っかかる入力を渡して
+変換が中止されること、中止までの時間が短いことを確認する。
+"""
+import time
+
+import pytest
+
+from app import (DEFAULT_CONVERSION_LIMITS, ConversionGuard, ConversionLimitError, dump_json_guarded,
+                 dump_xml_guarded, dump_yaml_guarded, load_json_guarded, load_xml_guarded,
+                 load_yaml_guarded)
+
+# 制限に引っかかる入力を中止するまでにかかってよい時間（秒）
+TIME_BOUND = 5
+
+
+def new_guard(**limits):
+    return ConversionGuard(**dict(DEFAULT_CONVERSION_LIMITS, **limits))
+
+
+def billion_laughs():
+    text = 'a: &a ["lol", "lol", "lol", "lol", "lol", "lol", "lol", "lol", "lol"]\n'
+    previous = "a"
+    for name in "bcdefghi":
+        text += f"{name}: &{name} [{', '.join(['*' + previous] * 9)}]\n"
+        previous = name
+    return text
+
+
+def chained_deep_anchors(count=10, depth=150):
+    """1つ1つは浅いが、エイリアスでつなぐと深くなるYAML"""
+    lines = []
+    inner = "1"
+    for index in range(count):
+        lines.append(f"a{index}: &a{index} " + "[" * depth + inner + "]" * depth)
+        inner = f"*a{index}"
+    return "\n".join(lines) + "\n"
+
+
+def assert_aborted(load, text, expected=ConversionLimitError):
+    start = time.perf_counter()
+    with pytest.raises(expected):
+        load(text, new_guard())
+    assert time.perf_counter() - start < TIME_BOUND
+
+
+@pytest.mark.parametrize("load, text", [
+    (load_yaml_guarded, billion_laughs()),
+    (load_yaml_guarded, "[" * 10000 + "]" * 10000),
+    (load_yaml_guarded, chained_deep_anchors()),
+    (load_yaml_guarded, "a: &a [*a]\n"),
+    (load_json_guarded, "[" * 300 + "]" * 300),
+    (load_json_guarded, '{"a":' * 300 + "1" + "}" * 300),
+    (load_xml_guarded, "<a>" * 100000 + "</a>" * 100000),
+], ids=["yaml-aliases", "yaml-deep", "yaml-chained-anchors", "yaml-recursive-alias",
+        "json-deep-list", "json-deep-object", "xml-deep"])
+def test_adversarial_input_is_rejected(load, text):
+    assert_aborted(load, text)
+
+
+def test_very_deep_json_is_rejected():
+    # json.loads 自体が深さの上限で RecursionError を出す
+    assert_aborted(load_json_guarded, "[" * 100000 + "]" * 100000, (ConversionLimitError, RecursionError))
+
+
+def test_compact_json_depth_is_checked():
+    with pytest.raises(ConversionLimitError):
+        load_json_guarded('[{"a":' * 150 + "1" + "}]" * 150, new_guard(), compact=True)
+
+
+@pytest.mark.parametrize("dump", [dump_json_guarded, dump_yaml_guarded, dump_xml_guarded])
+def test_output_size_limit(dump):
+    data = [{"name": f"user{i}", "tags": ["a", "b"]} for i in range(5000)]
+    with pytest.raises(ConversionLimitError):
+        dump(data, new_guard(max_output_size=10000))
+
+
+def test_timeout():
+    text = "<root>" + "<item>x</item>" * 50000 + "</root>"
+    with pytest.raises(ConversionLimitError):
+        load_xml_guarded(text, new_guard(timeout=0))
+
+
+def test_normal_input_converts():
+    guard = new_guard()
+    data = load_json_guarded('[{"a": {"b": [1, 2]}}, {"a": {"b": []}}]', guard)
+    assert load_yaml_guarded(dump_yaml_guarded(data, guard), guard) == data
+    assert load_json_guarded(dump_json_guarded(data, guard), guard) == data
+    assert "<b>" in dump_xml_guarded(data, guard)
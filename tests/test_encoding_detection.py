@@ -0,0 +1,34 @@
+"""文字コードの判定のテスト"""
+import pytest
+
+from app import decode_file_data, detect_encoding
+
+
+@pytest.mark.parametrize("text, encoding", [
+    ("abc\n", "utf-16-le"),
+    ("abc\n", "utf-16-be"),
+    ("あいう\nえお\n", "utf-16-le"),
+    ("あいう\nえお\n", "utf-16-be"),
+    ("x\n𠮷\n", "utf-32-le"),
+    ("x\n𠮷\n", "utf-32-be"),
+])
+def test_detects_utf16_and_utf32_without_bom(text, encoding):
+    data = text.encode(encoding)
+    assert detect_encoding(data)[0] == encoding
+    assert decode_file_data(data)[0] == text
+
+
+@pytest.mark.parametrize("data", [
+    b"abcd\x00def",
+    b"abcd\x00defg",
+    b'{"a": "x\x00y"}\n' * 3,
+    "日本語\x00テキスト\n".encode("utf-8"),
+])
+def test_stray_nul_stays_utf8(data):
+    assert detect_encoding(data)[0] == "utf-8"
+    assert decode_file_data(data)[0] == data.decode("utf-8")
+
+
+def test_odd_length_file_is_not_utf16():
+    data = "abc\n".encode("utf-16-le") + b"x"
+    assert detect_encoding(data)[0] == "utf-8"
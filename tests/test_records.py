@@ -0,0 +1,22 @@
+"""レコード配列とCSV/TSVの相互変換のテスト"""
+import json
+
+from app import flatten_record, iter_delimited_records, records_to_delimited, records_to_json_array
+
+
+def test_flatten_keeps_both_values_when_keys_collide():
+    assert flatten_record({"a.b": 1, "a": {"b": 2}}) == {"a.b": 1, "a": {"b": 2}}
+    assert flatten_record({"a": {"b": 2}, "a.b": 1}) == {"a": {"b": 2}, "a.b": 1}
+    assert flatten_record({"x": {"y": 1}}) == {"x.y": 1}
+
+
+def test_colliding_keys_round_trip_through_csv():
+    text = "".join(records_to_delimited([{"a.b": 1, "a": {"b": 2}}], ",", "flatten", ".", 1000, []))
+    assert list(iter_delimited_records(text, typed=True)) == [{"a.b": 1, "a": {"b": 2}}]
+
+
+def test_typed_cells_keep_nan_and_infinity_as_strings():
+    records = list(iter_delimited_records("x,y,z\n-Infinity,NaN,[Infinity]\n", typed=True))
+    assert records == [{"x": "-Infinity", "y": "NaN", "z": "[Infinity]"}]
+    # 出力は標準のJSONとして読み込める
+    assert json.loads("".join(records_to_json_array(records))) == records